@@ -2,18 +2,21 @@ import base64
 import hashlib
 import json
 import os
+import re
 import uuid
 import time
 import secrets
 import threading
 from contextvars import ContextVar
 from datetime import datetime, timedelta
+from itertools import chain
 from mimetypes import guess_type
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, Union, Literal, Set
 
 import dotenv
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -46,6 +49,7 @@ from excel_service import (
     extract_country_from_content
 )
 from news_store import news_store
+from content_hash import content_digest
 from prompt_config import (
     TEAM_INSTRUCTIONS,
     EXPECTED_OUTPUT,
@@ -126,7 +130,10 @@ def get_rag_store():
         try:
             # Lazy import to avoid import-time errors
             from rag_store import RagStore
-            _rag_store = RagStore()
+            # Opt-in: with RAG_INDEX_DIR set, indexed documents are written there and survive restarts;
+            # unset keeps the index in memory only
+            index_dir = os.getenv("RAG_INDEX_DIR", "").strip()
+            _rag_store = RagStore(index_dir=index_dir or None)
             print("✓ RagStore initialized successfully")
         except Exception as e:
             print(f"⚠ Warning: RagStore initialization failed: {e}")
@@ -150,6 +157,8 @@ def get_rag_store():
                     })()
                 def index_text_bytes(self, *args, **kwargs): 
                     return self.index_pdf_bytes(*args, **kwargs)
+                def index_many(self, files, *args, **kwargs):
+                    return [self.index_pdf_bytes(data, filename) for data, filename in files]
                 def register_stub(self, name, type_, message): 
                     return type('obj', (object,), {
                         'id': str(__import__('uuid').uuid4()),
@@ -866,7 +875,8 @@ def build_formatter_agent() -> Agent:
 
 
 def compute_tag_key(data: bytes) -> str:
-    return hashlib.md5(data).hexdigest()
+    # Must match RagStore.content_hash, which the preloaded-documents listing uses as tag_key
+    return content_digest(data)
 
 
 def estimate_pages(content: str) -> int:
@@ -875,9 +885,16 @@ def estimate_pages(content: str) -> int:
     return max(1, (len(content) + 2999) // 3000)
 
 
-def parse_news_section(section: str) -> Optional[Dict[str, str]]:
-    import re
+# parse_news_* 使用的正規表示式（模組載入時編譯一次）
+_NEWS_SECTION_SPLIT_RE = re.compile(r'\n###\s+')
+_PUBLISH_DATE_RE = re.compile(r'發布時間[：:]\s*(\d{4}[-年]\d{1,2}[-月]\d{1,2}日?)')
+_URL_RE = re.compile(r'https?://[^\s\)]+')
+_SUMMARY_COUNTRY_HEADING_RE = re.compile(
+    r'##\s*(越南|泰國|印尼|菲律賓|柬埔寨|新加坡|馬來西亞|緬甸|寮國|東南亞)(\s+[A-Za-z]+)?\s*\n*'
+)
 
+
+def parse_news_section(section: str) -> Optional[Dict[str, str]]:
     if not section.strip():
         return None
 
@@ -895,13 +912,13 @@ def parse_news_section(section: str) -> Optional[Dict[str, str]]:
 
     # 提取發布時間
     publish_date = ""
-    date_match = re.search(r'發布時間[：:]\s*(\d{4}[-年]\d{1,2}[-月]\d{1,2}日?)', article_content)
+    date_match = _PUBLISH_DATE_RE.search(article_content)
     if date_match:
         publish_date = date_match.group(1)
 
     # 提取 URL
     url = ""
-    url_match = re.search(r'https?://[^\s\)]+', article_content)
+    url_match = _URL_RE.search(article_content)
     if url_match:
         url = url_match.group(0)
 
@@ -927,11 +944,9 @@ def parse_news_section(section: str) -> Optional[Dict[str, str]]:
 
 def parse_news_articles(content: str) -> List[Dict[str, str]]:
     """解析新聞內容，返回獨立新聞列表"""
-    import re
-
     articles: List[Dict[str, str]] = []
     # 使用 ### 作為新聞分隔符
-    sections = re.split(r'\n###\s+', content)
+    sections = _NEWS_SECTION_SPLIT_RE.split(content)
 
     for section in sections:
         article = parse_news_section(section)
@@ -943,9 +958,7 @@ def parse_news_articles(content: str) -> List[Dict[str, str]]:
 
 def parse_news_articles_streaming(content: str) -> List[Dict[str, str]]:
     """流式解析：只回傳已完成的新聞（排除最後一段未結束的 section）"""
-    import re
-
-    sections = re.split(r'\n###\s+', content)
+    sections = _NEWS_SECTION_SPLIT_RE.split(content)
     if len(sections) <= 2:
         return []
 
@@ -1154,7 +1167,7 @@ def build_research_document(
         content_parts.append(f"## 回覆重點\n{assistant_content}")
     if summary_output:
         # 移除摘要中的國家名稱標題（如 ##菲律賓、##泰國 Thailand 等）
-        cleaned_summary = re.sub(r'##\s*(越南|泰國|印尼|菲律賓|柬埔寨|新加坡|馬來西亞|緬甸|寮國|東南亞)(\s+[A-Za-z]+)?\s*\n*', '', summary_output)
+        cleaned_summary = _SUMMARY_COUNTRY_HEADING_RE.sub('', summary_output)
         content_parts.append(f"## 摘要\n{cleaned_summary}")
     if memo_output:
         content_parts.append(f"## Credit Memo\n{memo_output}")
@@ -2109,7 +2122,22 @@ async def upload_documents(request: Request, files: List[UploadFile] = File(...)
     if not files:
         return JSONResponse({"error": "No files provided"}, status_code=400)
 
+    def document_entry(stored, tag_key: str, tags: List[str]) -> Dict[str, Any]:
+        return {
+            "id": stored.id,
+            "name": stored.name,
+            "type": stored.type,
+            "pages": stored.pages or "-",
+            "tags": tags,
+            "tag_key": tag_key,
+            "status": stored.status,
+            "message": stored.message,
+            "preview": stored.preview,
+        }
+
     results = []
+    # PDF / text uploads are indexed together afterwards so they are parsed concurrently
+    batch = []
     for file in files:
         filename = file.filename or f"upload-{uuid.uuid4()}"
         ext = os.path.splitext(filename)[1].lower()
@@ -2117,12 +2145,13 @@ async def upload_documents(request: Request, files: List[UploadFile] = File(...)
         tag_key = compute_tag_key(data)
         stored_tags = get_doc_tags(tag_key, user_id=user_id)
 
+        if ext == ".pdf" or ext in {".txt", ".md", ".csv"}:
+            batch.append((len(results), data, filename, tag_key, stored_tags))
+            results.append(None)
+            continue
+
         try:
-            if ext == ".pdf":
-                stored = get_rag_store().index_pdf_bytes(data, filename)
-            elif ext in {".txt", ".md", ".csv"}:
-                stored = get_rag_store().index_text_bytes(data, filename)
-            elif ext in IMAGE_EXTENSIONS:
+            if ext in IMAGE_EXTENSIONS:
                 doc_id = str(uuid.uuid4())
                 mime_type, _ = guess_type(filename)
                 mime_type = mime_type or f"image/{ext.lstrip('.')}"
@@ -2148,19 +2177,17 @@ async def upload_documents(request: Request, files: List[UploadFile] = File(...)
         except Exception as exc:
             stored = get_rag_store().register_stub(filename, ext.upper().lstrip(".") or "FILE", str(exc))
 
-        results.append(
-            {
-                "id": stored.id,
-                "name": stored.name,
-                "type": stored.type,
-                "pages": stored.pages or "-",
-                "tags": stored_tags,
-                "tag_key": tag_key,
-                "status": stored.status,
-                "message": stored.message,
-                "preview": stored.preview,
-            }
+        results.append(document_entry(stored, tag_key, stored_tags))
+
+    if batch:
+        # Parsing and embedding block, so they run off the event loop
+        indexed = await run_in_threadpool(
+            get_rag_store().index_many,
+            [(data, filename) for _, data, filename, _, _ in batch],
+            [tag_key for _, _, _, tag_key, _ in batch],
         )
+        for (slot, _, _, tag_key, stored_tags), stored in zip(batch, indexed):
+            results[slot] = document_entry(stored, tag_key, stored_tags)
 
     return {"documents": results}
 
@@ -2177,7 +2204,7 @@ async def get_preloaded_documents(request: Request):
         try:
             data = file_path.read_bytes()
             tag_key = compute_tag_key(data)
-            stored = get_rag_store().index_pdf_bytes(data, file_path.name)
+            stored = get_rag_store().index_pdf_bytes(data, file_path.name, content_hash=tag_key)
             results.append(
                 {
                     "id": stored.id,
@@ -2828,15 +2855,30 @@ async def export_and_send_news(req: ExportNewsRequest, request: Request):
         )
 
 
+def _stream_records_json(records: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """逐筆序列化記錄，輸出與 {"documents": [...]} 相同的 JSON，不需先載入全部記錄"""
+    yield b'{"documents":['
+    for index, record in enumerate(records):
+        chunk = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        yield chunk if index == 0 else b"," + chunk
+    yield b"]}"
+
+
 @app.get("/api/news/records")
-async def get_news_records(request: Request):
+async def get_news_records(request: Request, summary: bool = False):
     """
     獲取所有新聞記錄
+
+    summary=true 時只回傳列表欄位（不含 content / preview / message）
     """
     user_id = require_authenticated_user_id(request)
     try:
-        records = news_store.get_all_records(user_id=user_id)
-        return JSONResponse(content={"documents": records})
+        records = news_store.iter_records(user_id=user_id, include_content=not summary)
+        # 先取第一筆再開始串流：連線或查詢失敗時仍回傳 500，而不是 200 加上被截斷的 JSON
+        first = next(records, None)
+        if first is not None:
+            records = chain((first,), records)
+        return StreamingResponse(_stream_records_json(records), media_type="application/json")
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -0,0 +1,17 @@
+"""Content hashing shared by upload dedup (RagStore) and tag keys (agno_api)."""
+from __future__ import annotations
+
+import hashlib
+
+
+def content_digest(data: bytes) -> str:
+    """Hex digest identifying uploaded content.
+
+    BLAKE2b-128 from hashlib. Digests are persisted (RagStore index, document tag keys), so the
+    algorithm must not depend on which optional packages happen to be installed.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    return content_digest(text.encode("utf-8"))
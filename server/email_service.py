@@ -3,14 +3,25 @@ Email 發送服務
 使用 SMTP 發送帶附件的郵件
 """
 import os
+import re
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+from email.message import EmailMessage
 from typing import Dict, List
 
 
+# HTML 跳脫表（str.translate 單次 C 層級掃描）
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+# 只允許 http/https 連結，避免 javascript: 等協定注入
+_SAFE_LINK_RE = re.compile(r'^https?://', re.IGNORECASE)
+
+
 def get_smtp_config() -> Dict[str, str]:
     """
     從環境變數獲取 SMTP 設定
@@ -57,29 +68,26 @@ def send_email_with_attachment(
             }
         
         # 創建郵件對象
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg['From'] = config["email_address"]
         msg['To'] = to_email
         msg['Subject'] = subject
         
         # 添加郵件內容
-        msg.attach(MIMEText(body, 'html', 'utf-8'))
+        msg.set_content(body, subtype='html', charset='utf-8')
         
-        # 添加附件
+        # 添加附件（EmailMessage 會自動 base64 編碼並正確處理中文檔名）
         if os.path.exists(attachment_path):
             print(f"📎 正在附加檔案: {attachment_path}")
             print(f"📎 檔案名稱: {attachment_name}")
             
             with open(attachment_path, 'rb') as f:
-                part = MIMEBase('application', 'vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-                part.set_payload(f.read())
-                encoders.encode_base64(part)
-                # 修正檔名格式（移除多餘空格）
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename="{attachment_name}"'
+                msg.add_attachment(
+                    f.read(),
+                    maintype='application',
+                    subtype='vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                    filename=attachment_name
                 )
-                msg.attach(part)
                 print(f"✅ 附件已加入郵件")
         else:
             print(f"❌ 附件檔案不存在: {attachment_path}")
@@ -125,7 +133,7 @@ def generate_news_report_html(document_name: str, news_items: List[Dict[str, str
     Returns:
         HTML 格式的郵件內容
     """
-    html = f"""
+    parts = [f"""
     <html>
     <head>
         <meta charset="UTF-8">
@@ -145,28 +153,30 @@ def generate_news_report_html(document_name: str, news_items: List[Dict[str, str
     <body>
         <div class="header">
             <h1>東南亞新聞輿情報告</h1>
-            <p>{document_name}</p>
+            <p>{(document_name or '').translate(_HTML_ESCAPE)}</p>
         </div>
         <div class="content">
             <p>以下是本次搜尋到的 <strong>{len(news_items)}</strong> 筆新聞：</p>
-    """
+    """]
     
+    # 以 list 收集片段後一次 join，避免逐筆 += 造成的重複字串複製
     for idx, news in enumerate(news_items, 1):
-        title = news.get('title', '無標題')
-        date = news.get('date', '')
-        summary = news.get('summary', '無摘要')[:300]
-        link = news.get('link', '')
+        title = (news.get('title', '無標題') or '').translate(_HTML_ESCAPE)
+        date = (news.get('date', '') or '').translate(_HTML_ESCAPE)
+        summary = (news.get('summary', '無摘要') or '')[:300].translate(_HTML_ESCAPE)
+        link = (news.get('link', '') or '').strip()
+        link = link.translate(_HTML_ESCAPE) if _SAFE_LINK_RE.match(link) else ''
         
-        html += f"""
+        parts.append(f"""
             <div class="news-item">
                 <div class="news-title">{idx}. {title}</div>
                 {f'<div class="news-date">發布時間：{date}</div>' if date else ''}
                 <div class="news-summary">{summary}</div>
                 {f'<div><a href="{link}" class="news-link" target="_blank">查看原文 →</a></div>' if link else ''}
             </div>
-        """
+        """)
     
-    html += """
+    parts.append("""
         </div>
         <div class="footer">
             <p>此報告由東南亞新聞輿情系統自動生成</p>
@@ -174,6 +184,6 @@ def generate_news_report_html(document_name: str, news_items: List[Dict[str, str
         </div>
     </body>
     </html>
-    """
+    """)
     
-    return html
+    return "".join(parts)
@@ -2,15 +2,160 @@
 Excel 生成服務
 從新聞文件內容中解析新聞列表並生成 Excel 報告
 """
+import hashlib
 import os
 import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
-from openai import OpenAI
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
 
+# openpyxl 與 openai 匯入成本高（openai 會帶入 httpx/pydantic），延遲到第一次使用時才匯入
+
+
+# 批次匯出時並行處理文件的執行緒上限
+BATCH_MAX_WORKERS = 8
+
+# 新聞解析結果快取（內容雜湊 -> 未翻譯的新聞列表），重複匯出同一文件時略過解析
+PARSE_CACHE_SIZE = 128
+_parse_cache: "OrderedDict[bytes, List[Dict[str, str]]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+# 標題翻譯快取（原始標題 -> 翻譯結果），只存成功的翻譯；跨文件重複的標題不再送 API
+TRANSLATION_CACHE_SIZE = 2048
+_translation_cache: "OrderedDict[str, str]" = OrderedDict()
+_translation_cache_lock = threading.Lock()
+
+# 批次翻譯的輸出 token 預算（每個標題），批次匯出合併成一次呼叫時避免回覆被截斷
+TRANSLATION_TOKENS_PER_TITLE = 40
+# 每次翻譯 API 呼叫最多送出的標題數（100 × 40 tokens，遠低於模型輸出上限）
+TRANSLATION_BATCH_SIZE = 100
+
+# 依 umask 計算一般新檔案的權限（模組載入時讀取一次；os.umask 只能以設定的方式讀取，執行緒中不宜呼叫）
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+# 摘要過濾：移除中文、英文、數字與常用標點以外的字元（只編譯一次）
+_NON_TEXT_RE = re.compile(r'[^\u4e00-\u9fff\u3000-\u303fa-zA-Z0-9\s，。！？、；：,.!?\'\"%-]')
+
+# 中文字元（用於判斷標題是否已是中文，C 層級計數取代逐字元 Python 迴圈）
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
+# 非新聞分段標題的關鍵字（回覆重點、國家分類標題等），合併為單一 regex
+SECTION_SKIP_KEYWORDS = ('回覆重點', '越南', '泰國', '印尼', '菲律賓', '柬埔寨',
+                         'Vietnam', 'Thailand', 'Indonesia', 'Philippines', 'Cambodia')
+_SKIP_KEYWORDS_RE = re.compile('|'.join(re.escape(k) for k in SECTION_SKIP_KEYWORDS))
+
+# 多篇新聞列表的 ### 分段標記
+_SECTION_SPLIT_RE = re.compile(r'\n###\s+')
+
+# 新聞解析用的 regex（模組載入時編譯一次，避免每段重複查 re 內部快取）
+_BOLD_DATE_RE = re.compile(r'\*\*發布時間\*\*[：:]\s*(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}[日]?)')
+_DATE_RE = re.compile(r'發布時間[：:]\s*(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}[日]?)')
+_SOURCE_LINK_RE = re.compile(r'\*\*來源\*\*[：:]\s*(https?://[^\s]+)')
+_BACKTICK_LINK_RE = re.compile(r'`(https?://[^`]+)`')
+_PLAIN_LINK_RE = re.compile(r'(https?://[^\s\)]+)')
+# 文末總結區塊的起點（只找切點再切片，不用 DOTALL .*$ 比對整段尾巴）
+_SUMMARY_CUT_RE = re.compile(r'\n##\s+(?:摘要|期間重點|覆蓋度|缺口|後續建議|Credit Memo)')
+
+# 摘要長度上限，以及清理前先截取的字元數（需足以在清理縮短後仍留下完整摘要）
+SUMMARY_MAX_CHARS = 500
+SUMMARY_SCAN_CHARS = 2000
+
+# 摘要清理：各步驟合併為單一 alternation，一次掃描完成（順序即原本逐步 re.sub 的優先順序）
+_HEADING_LINE_RE = re.compile(r'^#[^\n]+\n+')
+_SINGLE_CLEANUP_RE = re.compile('|'.join([
+    r'\*\*發布時間\*\*[：:][^\n]+\n*',  # 粗體發布時間
+    r'發布時間[：:][^\n]+\n*',  # 沒有粗體的發布時間
+    r'\*\*來源\*\*[：:][^\n]+',  # 來源
+    r'`https?://[^`]+`',  # 反引號中的 URL
+    r'\[[^\]]*\]\([^\)]*https?://[^\)]*\)',  # Markdown 連結
+    r'https?://[^\s\)\]]+',  # 其他 URL
+    r'\*\*[^*]+\*\*[：:]?',  # 粗體標記
+    r'[\[\]\(\)「」『』【】•·▪▸►▶]',  # 括號與列表符號
+]))
+_DATE_CLEANUP_RE = re.compile('|'.join([
+    r'\*\*發布時間\*\*[：:][^\n]+\n*',  # 粗體格式
+    r'發布時間[：:][^\n]+\n*',  # 普通格式
+    r'\d{4}[-/年]\d{1,2}[-/月]\d{1,2}[日]?',  # 日期
+]))
+_SECTION_CLEANUP_RE = re.compile('|'.join([
+    r'\[([^\]]*)\]\([^\)]*\)',  # Markdown 連結（保留文字）
+    r'\([^\)]*https?://[^\)]*\)',  # 括號內的 URL
+    r'\[[^\]]*\]',  # 剩餘的中括號
+    r'`https?://[^`]+`',  # 反引號中的 URL
+    r'https?://[^\s\)\]]+',  # 其他 URL
+    r'#+\s*',  # 標題符號
+    r'\(\s*\)',  # 空括號
+    r'\*\*[^*]+\*\*[：:]?',  # 粗體標記
+    r'[•·▪▸►▶]',  # 列表符號
+]))
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 匯出檔名：移除文字、空白與連字號以外的字元
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
+
+# URL 網域擷取與翻譯結果的編號前綴
+_URL_DOMAIN_RE = re.compile(r'https?://(?:www\.)?([a-zA-Z0-9.-]+)')
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)\.\s*(.*)$')
+
+# 國家關鍵字映射（文件名稱判斷用）
+COUNTRY_KEYWORDS = {
+    '越南': ['越南', 'vietnam', 'vn', 'viet'],
+    '泰國': ['泰國', 'thailand', 'thai'],
+    '印尼': ['印尼', 'indonesia', 'indonesian'],
+    '菲律賓': ['菲律賓', 'philippines', 'philippine', 'filipino'],
+    '柬埔寨': ['柬埔寨', 'cambodia', 'cambodian'],
+    '新加坡': ['新加坡', 'singapore'],
+    '馬來西亞': ['馬來西亞', 'malaysia', 'malaysian'],
+    '緬甸': ['緬甸', 'myanmar', 'burma'],
+    '寮國': ['寮國', 'laos', 'lao']
+}
+
+# 關鍵字 -> 國家，以及一次掃描所有關鍵字的預編譯 regex（長關鍵字優先）
+_KEYWORD_TO_COUNTRY = {
+    keyword: country
+    for country, keywords in COUNTRY_KEYWORDS.items()
+    for keyword in keywords
+}
+_COUNTRY_KEYWORD_RE = re.compile(
+    '|'.join(re.escape(k) for k in sorted(_KEYWORD_TO_COUNTRY, key=len, reverse=True))
+)
+# 名稱判斷用：以 lookahead 在每個位置比對，重疊的關鍵字（如 laosingapore）也不會漏掉
+_COUNTRY_KEYWORD_SCAN_RE = re.compile('(?=(' + _COUNTRY_KEYWORD_RE.pattern + '))')
+# 名稱同時含多國關鍵字時，依 COUNTRY_KEYWORDS 的順序決定
+_COUNTRY_PRIORITY = {country: i for i, country in enumerate(COUNTRY_KEYWORDS)}
+
+# 網域到國家的映射（從 TRUSTED_NEWS_SOURCES 提取）
+TRUSTED_DOMAIN_COUNTRIES = {
+    'viet-jo.com': '越南',
+    'cafef.vn': '越南',
+    'vnexpress.net': '越南',
+    'vietnamfinance.vn': '越南',
+    'vir.com.vn': '越南',
+    'vietnambiz.vn': '越南',
+    'tapchikinhtetaichinh.vn': '越南',
+    'bangkokpost.com': '泰國',
+    'techsauce.co': '泰國',
+    'fintechnews.sg': '新加坡',
+    'fintechnews.ph': '菲律賓',
+    'khmertimeskh.com': '柬埔寨',
+    'cc-times.com': '柬埔寨',
+    'phnompenhpost.com': '柬埔寨',
+    'dealstreetasia.com': '東南亞',
+    'techinasia.com': '東南亞',
+    'asia.nikkei.com': '東南亞',
+    'heaptalk.com': '東南亞',
+}
+
+# 所有可信網域合併成一個 alternation，取代「每個網址 × 每個網域」的巢狀子字串比對
+_TRUSTED_DOMAIN_RE = re.compile(
+    '|'.join(re.escape(d) for d in sorted(TRUSTED_DOMAIN_COUNTRIES, key=len, reverse=True))
+)
 
 def extract_country_from_content(content: str, fallback_name: str = "") -> str:
     """
@@ -23,52 +168,13 @@ def extract_country_from_content(content: str, fallback_name: str = "") -> str:
     Returns:
         國家名稱（中文）
     """
-    # 區域英文轉中文映射
-    region_to_chinese = {
-        'Vietnam': '越南',
-        'Thailand': '泰國',
-        'Singapore': '新加坡',
-        'Philippines': '菲律賓',
-        'Cambodia': '柬埔寨',
-        'Indonesia': '印尼',
-        'Malaysia': '馬來西亞',
-        'Myanmar': '緬甸',
-        'Laos': '寮國',
-        'Southeast Asia': '東南亞',
-    }
-    
-    # 網域到國家的映射（從 TRUSTED_NEWS_SOURCES 提取）
-    domain_to_country = {
-        'viet-jo.com': '越南',
-        'cafef.vn': '越南',
-        'vnexpress.net': '越南',
-        'vietnamfinance.vn': '越南',
-        'vir.com.vn': '越南',
-        'vietnambiz.vn': '越南',
-        'tapchikinhtetaichinh.vn': '越南',
-        'bangkokpost.com': '泰國',
-        'techsauce.co': '泰國',
-        'fintechnews.sg': '新加坡',
-        'fintechnews.ph': '菲律賓',
-        'khmertimeskh.com': '柬埔寨',
-        'cc-times.com': '柬埔寨',
-        'phnompenhpost.com': '柬埔寨',
-        'dealstreetasia.com': '東南亞',
-        'techinasia.com': '東南亞',
-        'asia.nikkei.com': '東南亞',
-        'heaptalk.com': '東南亞',
-    }
-    
-    # 嘗試從內容中的 URL 提取國家
-    import re
-    url_pattern = r'https?://(?:www\.)?([a-zA-Z0-9.-]+)'
-    urls = re.findall(url_pattern, content)
-    
-    for url_domain in urls:
-        # 檢查是否匹配任何已知網域
-        for domain, country in domain_to_country.items():
-            if domain in url_domain:
-                return country
+    # 嘗試從內容中的 URL 提取國家（每個網址主機只做一次預編譯網域比對）
+    # 先以字面字串預篩，沒有 http 時不必啟動 regex 掃描
+    if 'http' in content:
+        for url_match in _URL_DOMAIN_RE.finditer(content):
+            domain_match = _TRUSTED_DOMAIN_RE.search(url_match.group(1))
+            if domain_match:
+                return TRUSTED_DOMAIN_COUNTRIES[domain_match.group(0)]
     
     # 如果沒找到 URL，使用文件名稱判斷（原有邏輯）
     return extract_country_from_name(fallback_name)
@@ -87,29 +193,17 @@ def extract_country_from_name(name: str) -> str:
     if not name:
         return " "
         
-    name_lower = name.lower()
-    
-    # 國家關鍵字映射
-    country_mapping = {
-        '越南': ['越南', 'vietnam', 'vn', 'viet'],
-        '泰國': ['泰國', 'thailand', 'thai'],
-        '印尼': ['印尼', 'indonesia', 'indonesian'],
-        '菲律賓': ['菲律賓', 'philippines', 'philippine', 'filipino'],
-        '柬埔寨': ['柬埔寨', 'cambodia', 'cambodian'],
-        '新加坡': ['新加坡', 'singapore'],
-        '馬來西亞': ['馬來西亞', 'malaysia', 'malaysian'],
-        '緬甸': ['緬甸', 'myanmar', 'burma'],
-        '寮國': ['寮國', 'laos', 'lao']
-    }
-    
-    # 檢查名稱中是否包含國家關鍵字
-    for country, keywords in country_mapping.items():
-        for keyword in keywords:
-            if keyword in name_lower:
-                return country
+    # 單次掃描名稱中的國家關鍵字，取順序最前的國家
+    best = None
+    for match in _COUNTRY_KEYWORD_SCAN_RE.finditer(name.lower()):
+        country = _KEYWORD_TO_COUNTRY[match.group(1)]
+        if best is None or _COUNTRY_PRIORITY[country] < _COUNTRY_PRIORITY[best]:
+            best = country
+            if _COUNTRY_PRIORITY[best] == 0:
+                break
     
     # 如果沒有匹配到，返回未知
-    return " "
+    return best or " "
 
 
 def translate_title_to_chinese(title: str) -> str:
@@ -126,7 +220,7 @@ def translate_title_to_chinese(title: str) -> str:
         return title
     
     # 簡單檢測：如果標題中中文字符超過 30%，認為已經是中文
-    chinese_chars = sum(1 for char in title if '\u4e00' <= char <= '\u9fff')
+    chinese_chars = len(_CJK_RE.findall(title))
     if chinese_chars / len(title) > 0.3:
         return title
     
@@ -135,9 +229,51 @@ def translate_title_to_chinese(title: str) -> str:
     return results.get(title, title)
 
 
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str):
+    """取得 OpenAI client（延遲匯入 openai；依 API key 快取，重複使用 httpx 連線池）"""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+def _take_cached_translations(titles: List[str], result: Dict[str, str]) -> List[str]:
+    """
+    從翻譯快取填入已翻譯過的標題
+    
+    Args:
+        titles: 待翻譯的標題
+        result: 結果字典（命中的翻譯直接寫入）
+        
+    Returns:
+        快取未命中、仍需呼叫 API 的標題
+    """
+    pending = []
+    with _translation_cache_lock:
+        for title in titles:
+            cached = _translation_cache.get(title)
+            if cached is None:
+                pending.append(title)
+            else:
+                _translation_cache.move_to_end(title)
+                result[title] = cached
+    return pending
+
+
+def _store_translations(translations: Dict[str, str]) -> None:
+    """將成功的翻譯寫入快取（超過上限時淘汰最久未使用的項目）"""
+    if not translations:
+        return
+    with _translation_cache_lock:
+        _translation_cache.update(translations)
+        for title in translations:
+            _translation_cache.move_to_end(title)
+        while len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+
+
 def batch_translate_titles(titles: List[str]) -> Dict[str, str]:
     """
-    批次翻譯多個新聞標題為繁體中文（單次 API 呼叫）
+    批次翻譯多個新聞標題為繁體中文（每 TRANSLATION_BATCH_SIZE 個標題一次 API 呼叫）
     
     Args:
         titles: 原始標題列表
@@ -148,33 +284,51 @@ def batch_translate_titles(titles: List[str]) -> Dict[str, str]:
     if not titles:
         return {}
     
-    # 過濾已經是中文的標題
+    # 過濾已經是中文的標題（重複標題只處理一次）
     titles_to_translate = []
     result = {}
     
-    for title in titles:
+    for title in dict.fromkeys(titles):
         if not title:
             result[title] = title
             continue
-        chinese_chars = sum(1 for char in title if '\u4e00' <= char <= '\u9fff')
+        chinese_chars = len(_CJK_RE.findall(title))
         if len(title) > 0 and chinese_chars / len(title) > 0.3:
             result[title] = title  # 已經是中文，不需翻譯
         else:
             titles_to_translate.append(title)
     
-    # 如果所有標題都是中文，直接返回
+    # 先查翻譯快取，只送出沒翻譯過的標題
+    titles_to_translate = _take_cached_translations(titles_to_translate, result)
+    
+    # 如果所有標題都是中文或已翻譯過，直接返回
     if not titles_to_translate:
         return result
     
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        # 沒有 API key，返回原始標題
+        for title in titles_to_translate:
+            result[title] = title
+        return result
+    
+    # 固定大小分批呼叫，標題再多輸出 token 預算也不會超過模型上限
+    for start in range(0, len(titles_to_translate), TRANSLATION_BATCH_SIZE):
+        _translate_batch(api_key, titles_to_translate[start:start + TRANSLATION_BATCH_SIZE], result)
+    return result
+
+
+def _translate_batch(api_key: str, titles_to_translate: List[str], result: Dict[str, str]) -> None:
+    """
+    單次 API 呼叫翻譯一批標題，結果寫入 result（失敗時保留原始標題）
+    
+    Args:
+        api_key: OpenAI API key
+        titles_to_translate: 需要翻譯的標題（不超過 TRANSLATION_BATCH_SIZE 個）
+        result: 結果字典 {原始標題: 翻譯後標題}
+    """
     try:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            # 沒有 API key，返回原始標題
-            for title in titles_to_translate:
-                result[title] = title
-            return result
-        
-        client = OpenAI(api_key=api_key)
+        client = _get_openai_client(api_key)
         
         # 構建批次翻譯提示
         numbered_titles = "\n".join([f"{i+1}. {t}" for i, t in enumerate(titles_to_translate)])
@@ -190,23 +344,27 @@ def batch_translate_titles(titles: List[str]) -> Dict[str, str]:
             model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
             messages=[{"role": "user", "content": prompt}],
             temperature=0,
-            max_completion_tokens=500
+            max_completion_tokens=max(500, TRANSLATION_TOKENS_PER_TITLE * len(titles_to_translate))
         )
         
         translated_text = response.choices[0].message.content.strip()
         print(f"📝 批次翻譯完成: {len(titles_to_translate)} 個標題")
         
-        # 解析翻譯結果
-        lines = translated_text.split("\n")
-        for i, title in enumerate(titles_to_translate):
-            if i < len(lines):
-                # 移除編號前綴 (如 "1. ", "2. " 等)
-                translated = re.sub(r'^\d+\.\s*', '', lines[i]).strip()
-                result[title] = translated if translated else title
-            else:
-                result[title] = title
-        
-        return result
+        # 解析翻譯結果：依 "N." 編號對應標題，空行或合併行不會讓後面的標題錯位
+        numbered = [_NUMBERED_LINE_RE.match(line) for line in translated_text.split("\n")]
+        numbered = [(int(m.group(1)), m.group(2).strip()) for m in numbered if m]
+        translations = dict(numbered)
+        translated_titles = {}
+        for i, title in enumerate(titles_to_translate, 1):
+            translated = translations.get(i, '')
+            if translated:
+                translated_titles[title] = translated
+            result[title] = translated if translated else title
+        
+        # 只有編號行數與標題數完全一致時才寫入快取，避免錯位的翻譯在之後的匯出中被重複使用
+        expected = list(range(1, len(titles_to_translate) + 1))
+        if len(numbered) == len(expected) and sorted(translations) == expected:
+            _store_translations(translated_titles)
         
     except Exception as e:
         import traceback
@@ -215,7 +373,6 @@ def batch_translate_titles(titles: List[str]) -> Dict[str, str]:
         # 翻譯失敗時返回原始標題
         for title in titles_to_translate:
             result[title] = title
-        return result
 
 
 def parse_news_from_content(content: str) -> List[Dict[str, str]]:
@@ -231,8 +388,130 @@ def parse_news_from_content(content: str) -> List[Dict[str, str]]:
     Returns:
         新聞列表，每個元素包含 title, date, summary, link
     """
+    news_items = _parse_news_raw(content)
+    _fill_translations(news_items)
+    return news_items
+
+
+def _parse_news_raw(content: str) -> List[Dict[str, str]]:
+    """
+    解析新聞列表但不翻譯標題（純函式，依內容雜湊快取結果）
+    
+    Args:
+        content: 文件內容（Markdown 格式）
+        
+    Returns:
+        新聞列表，每個元素包含 original_title, title(空), date, summary, link；
+        回傳的是快取的複本，可安全修改
+    """
+    key = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            _parse_cache.move_to_end(key)
+            return [dict(item) for item in cached]
+    
+    news_items = _extract_news_items(content)
+    
+    with _parse_cache_lock:
+        _parse_cache[key] = [dict(item) for item in news_items]
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return news_items
+
+
+def _fill_translations(news_items: List[Dict[str, str]]) -> None:
+    """
+    批次翻譯新聞標題並寫回 title 欄位（移除暫存的 original_title）
+    
+    Args:
+        news_items: _parse_news_raw 回傳的新聞列表
+    """
+    if not news_items:
+        return
+    
+    # 一般批次只需一次 API 呼叫（超過 TRANSLATION_BATCH_SIZE 時分批）；重複標題只送一次
+    unique_titles = list(dict.fromkeys(item['original_title'] for item in news_items))
+    title_translations = batch_translate_titles(unique_titles)
+    for item in news_items:
+        original = item.pop('original_title', '')
+        item['title'] = title_translations.get(original, original)
+
+
+def _section_cleanup_repl(match: re.Match) -> str:
+    """Markdown 連結只保留文字（文字本身仍需清理），其餘符合項目直接移除"""
+    link_text = match.group(1)
+    if link_text:
+        return _SECTION_CLEANUP_RE.sub(_section_cleanup_repl, link_text)
+    return ''
+
+
+def _iter_sections(content: str) -> Iterator[str]:
+    """
+    依 ### 標題逐段產生新聞區塊（等同 re.split(r'\n###\s+', content)，但以生成器切片）
+    
+    Args:
+        content: 文件內容
+        
+    Yields:
+        各段內容
+    """
+    start = 0
+    for match in _SECTION_SPLIT_RE.finditer(content):
+        yield content[start:match.start()]
+        start = match.end()
+    yield content[start:]
+
+
+def _clean_single_summary(text: str) -> str:
+    """清理單篇新聞的摘要文字（移除標題、發布時間、來源、URL 與格式符號）"""
+    text = _HEADING_LINE_RE.sub('', text)  # 移除標題
+    # 單次掃描移除發布時間、來源、URL、粗體標記、括號與列表符號
+    text = _SINGLE_CLEANUP_RE.sub('', text)
+    # 過濾非中英文字符（保留中文、英文、數字、常用標點）
+    text = _NON_TEXT_RE.sub('', text)
+    text = _WHITESPACE_RE.sub(' ', text)  # 合併換行與空白
+    return text.strip()
+
+
+def _clean_section_summary(text: str) -> str:
+    """清理新聞列表中單一段落的摘要文字"""
+    # 移除發布時間（多種格式）與日期
+    text = _DATE_CLEANUP_RE.sub('', text)
+    # 分隔線之後的內容全部捨棄
+    rule_pos = text.find('---')
+    if rule_pos != -1:
+        text = text[:rule_pos]
+    # 單次掃描移除 URL、標題符號、空括號、粗體標記與列表符號（Markdown 連結保留文字）
+    text = _SECTION_CLEANUP_RE.sub(_section_cleanup_repl, text)
+    # 過濾非中英文字符（保留中文、英文、數字、常用標點）
+    text = _NON_TEXT_RE.sub('', text)
+    text = _WHITESPACE_RE.sub(' ', text)
+    return text.strip()
+
+
+def _summarize(text: str, clean) -> str:
+    """
+    先只清理開頭 SUMMARY_SCAN_CHARS 個字元，足夠產生完整摘要時就不處理其餘內容
+    
+    Args:
+        text: 原始摘要文字
+        clean: 清理函式
+        
+    Returns:
+        清理後、最多 SUMMARY_MAX_CHARS 字的摘要
+    """
+    if len(text) > SUMMARY_SCAN_CHARS:
+        summary = clean(text[:SUMMARY_SCAN_CHARS])
+        if len(summary) >= SUMMARY_MAX_CHARS:
+            return summary[:SUMMARY_MAX_CHARS]
+    # 文字不長，或清理後不足摘要長度（大多是 URL/格式符號）時才清理全文
+    return clean(text)[:SUMMARY_MAX_CHARS]
+
+
+def _extract_news_items(content: str) -> List[Dict[str, str]]:
+    """從文件內容擷取新聞項目（parse_news_from_content 的解析本體）"""
     news_items = []
-    original_titles = []  # 收集所有原始標題
     
     # 檢測是否為單篇新聞文檔（以 # 標題開頭，包含發布時間和來源）
     if content.strip().startswith('# ') and '**發布時間**' in content and '**來源**' in content:
@@ -251,61 +530,44 @@ def parse_news_from_content(content: str) -> List[Dict[str, str]]:
         if lines:
             original_title = lines[0].replace('#', '').strip()
             news_item['original_title'] = original_title
-            original_titles.append(original_title)
         
         # 提取發布時間
-        date_pattern = r'\*\*發布時間\*\*[：:]\s*(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}[日]?)'
-        date_match = re.search(date_pattern, content)
+        date_match = _BOLD_DATE_RE.search(content)
         if date_match:
             news_item['date'] = date_match.group(1).replace('年', '-').replace('月', '-').replace('日', '')
         
         # 提取來源 URL
-        source_pattern = r'\*\*來源\*\*[：:]\s*(https?://[^\s]+)'
-        source_match = re.search(source_pattern, content)
+        source_match = _SOURCE_LINK_RE.search(content)
         if source_match:
             news_item['link'] = source_match.group(1).strip()
         
         # 提取摘要（移除標題、發布時間和來源後的內容）
-        summary_text = content
-        summary_text = re.sub(r'^#[^\n]+\n+', '', summary_text)  # 移除標題
-        summary_text = re.sub(r'\*\*發布時間\*\*[：:][^\n]+\n*', '', summary_text)  # 移除發布時間
-        summary_text = re.sub(r'發布時間[：:][^\n]+\n*', '', summary_text)  # 移除沒有粗體的發布時間
-        summary_text = re.sub(r'\*\*來源\*\*[：:][^\n]+', '', summary_text)  # 移除來源
-        # 移除所有 URL
-        summary_text = re.sub(r'`https?://[^`]+`', '', summary_text)  # 移除反引號中的 URL
-        summary_text = re.sub(r'\[[^\]]*\]\([^\)]*https?://[^\)]*\)', '', summary_text)  # 移除 Markdown 連結
-        summary_text = re.sub(r'https?://[^\s\)\]]+', '', summary_text)  # 移除所有其他 URL
-        # 移除特殊標記符號和格式
-        summary_text = re.sub(r'\*\*[^*]+\*\*[：:]?', '', summary_text)  # 移除粗體標記
-        summary_text = re.sub(r'[\[\]\(\)「」『』【】]', '', summary_text)  # 移除各種括號
-        summary_text = re.sub(r'[•·▪▸►▶]', '', summary_text)  # 移除列表符號
-        # 過濾非中英文字符（保留中文、英文、數字、常用標點）
-        summary_text = re.sub(r'[^\u4e00-\u9fff\u3000-\u303fa-zA-Z0-9\s，。！？、；：,.!?\'\"%-]', '', summary_text)
-        summary_text = re.sub(r'\n+', ' ', summary_text)  # 合併換行
-        summary_text = re.sub(r'\s+', ' ', summary_text)  # 合併空白
-        summary_text = summary_text.strip()
-        
-        news_item['summary'] = summary_text[:500] if summary_text else ''
+        news_item['summary'] = _summarize(content, _clean_single_summary)
         
         if news_item['original_title'] and news_item['summary']:
             news_items.append(news_item)
     else:
         # 原有的多篇新聞列表解析邏輯（RESEARCH 類型）
         # 先移除文末的總結區塊
-        summary_section_pattern = r'\n##\s+(摘要|期間重點|覆蓋度|缺口|後續建議|Credit Memo).*$'
-        content = re.sub(summary_section_pattern, '', content, flags=re.DOTALL)
+        summary_cut = _SUMMARY_CUT_RE.search(content)
+        if summary_cut:
+            content = content[:summary_cut.start()]
         
-        # 按 ### 標題分割新聞項目
-        sections = re.split(r'\n###\s+', content)
-        
-        for section in sections:
+        # 按 ### 標題分割新聞項目（逐段切片，不一次建立整個分段列表）
+        for section in _iter_sections(content):
             section = section.strip()
             if not section or len(section) < 20:
                 continue
             
+            # 以 str.find 切出標題行與內文，不必把整段 split 成行列表
+            newline_pos = section.find('\n')
+            if newline_pos == -1:
+                first_line, body = section.strip(), ''
+            else:
+                first_line, body = section[:newline_pos].strip(), section[newline_pos + 1:]
+            
             # 跳過非新聞標題
-            first_line = section.split('\n')[0].strip()
-            if any(keyword in first_line for keyword in ['回覆重點', '越南', '泰國', '印尼', '菲律賓', '柬埔寨', 'Vietnam', 'Thailand', 'Indonesia', 'Philippines', 'Cambodia']):
+            if _SKIP_KEYWORDS_RE.search(first_line):
                 continue
             if first_line.startswith('#') or first_line.startswith('【'):
                 continue
@@ -319,71 +581,180 @@ def parse_news_from_content(content: str) -> List[Dict[str, str]]:
             }
             
             # 提取標題（第一行）
-            lines = section.split('\n')
-            if lines:
-                original_title = lines[0].strip()
-                news_item['original_title'] = original_title
-                original_titles.append(original_title)
+            news_item['original_title'] = first_line
             
-            # 提取發布時間
-            date_pattern = r'發布時間[：:]\s*(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}[日]?)'
-            date_match = re.search(date_pattern, section)
+            # 提取發布時間（先以字面字串預篩）
+            date_match = _DATE_RE.search(section) if '發布時間' in section else None
             if date_match:
                 news_item['date'] = date_match.group(1).replace('年', '-').replace('月', '-').replace('日', '')
             
-            # 提取連結
-            link_pattern = r'`(https?://[^`]+)`'
-            link_match = re.search(link_pattern, section)
-            if link_match:
-                news_item['link'] = link_match.group(1).strip()
-            else:
-                plain_link_match = re.search(r'(https?://[^\s\)]+)', section)
-                if plain_link_match:
-                    news_item['link'] = plain_link_match.group(1).strip()
+            # 提取連結（段落沒有 http 時略過 regex）
+            if 'http' in section:
+                link_match = _BACKTICK_LINK_RE.search(section)
+                if link_match:
+                    news_item['link'] = link_match.group(1).strip()
+                else:
+                    plain_link_match = _PLAIN_LINK_RE.search(section)
+                    if plain_link_match:
+                        news_item['link'] = plain_link_match.group(1).strip()
             
             # 提取摘要
-            summary_text = section
-            if lines:
-                summary_text = '\n'.join(lines[1:])
-            # 移除發布時間（多種格式）
-            summary_text = re.sub(r'\*\*發布時間\*\*[：:][^\n]+\n*', '', summary_text)  # 粗體格式
-            summary_text = re.sub(r'發布時間[：:][^\n]+\n*', '', summary_text)  # 普通格式
-            summary_text = re.sub(r'\d{4}[-/年]\d{1,2}[-/月]\d{1,2}[日]?', '', summary_text)  # 移除日期格式
-            summary_text = re.sub(r'---+.*$', '', summary_text, flags=re.DOTALL)
-            # 移除所有類型的 URL
-            summary_text = re.sub(r'\[([^\]]*)\]\([^\)]*\)', r'\1', summary_text)  # Markdown 連結轉文字
-            summary_text = re.sub(r'\([^\)]*https?://[^\)]*\)', '', summary_text)  # 括號內的 URL
-            summary_text = re.sub(r'\[[^\]]*\]', '', summary_text)  # 移除剩餘的中括號
-            summary_text = re.sub(r'`https?://[^`]+`', '', summary_text)  # 反引號中的 URL
-            summary_text = re.sub(r'https?://[^\s\)\]]+', '', summary_text)  # 所有其他 URL
-            summary_text = re.sub(r'#+\s*', '', summary_text)
-            summary_text = re.sub(r'\(\s*\)', '', summary_text)  # 移除空括號
-            # 移除特殊標記符號
-            summary_text = re.sub(r'\*\*[^*]+\*\*[：:]?', '', summary_text)  # 移除粗體標記
-            summary_text = re.sub(r'[•·▪▸►▶]', '', summary_text)  # 移除列表符號
-            # 過濾非中英文字符（保留中文、英文、數字、常用標點）
-            summary_text = re.sub(r'[^\u4e00-\u9fff\u3000-\u303fa-zA-Z0-9\s，。！？、；：,.!?\'\"%-]', '', summary_text)
-            summary_text = re.sub(r'\n+', ' ', summary_text)
-            summary_text = re.sub(r'\s+', ' ', summary_text)
-            summary_text = summary_text.strip()
-            
-            news_item['summary'] = summary_text[:500] if summary_text else ''
+            news_item['summary'] = _summarize(body, _clean_section_summary)
             
             # 只有標題和摘要都存在時才加入列表
             if news_item['original_title'] and news_item['summary']:
                 news_items.append(news_item)
     
-    # 批次翻譯所有標題（單次 API 呼叫）
-    if original_titles:
-        title_translations = batch_translate_titles(original_titles)
-        for item in news_items:
-            original = item.get('original_title', '')
-            item['title'] = title_translations.get(original, original)
-            del item['original_title']  # 移除暫存欄位
-    
     return news_items
 
 
+# 新聞報告工作表的欄位標題與欄寬
+EXCEL_HEADERS = ("編號", "新聞標題", "發布時間", "新聞摘要", "新聞連結", "來源國家")
+EXCEL_COLUMN_WIDTHS = {
+    'A': 8,   # 編號
+    'B': 40,  # 標題
+    'C': 15,  # 時間
+    'D': 60,  # 摘要
+    'E': 50,  # 連結
+    'F': 20   # 來源國家
+}
+
+
+@lru_cache(maxsize=1)
+def _excel_style_parts() -> Dict[str, Any]:
+    """
+    建立工作表共用的字型、填色與對齊物件（延遲匯入 openpyxl，整個行程只建立一次）
+    
+    Returns:
+        包含 header_fill, header_font, header_alignment, body_alignment 的字典
+    """
+    from openpyxl.styles import Font, Alignment, PatternFill
+    
+    return {
+        "header_fill": PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        "header_font": Font(bold=True, color="FFFFFF", size=11),
+        "header_alignment": Alignment(horizontal="center", vertical="center"),
+        "body_alignment": Alignment(vertical="top", wrap_text=True),
+    }
+
+
+def _styled_row(ws, values, style_name: str) -> list:
+    """
+    將一列數值包成套用具名樣式的 WriteOnlyCell
+    
+    Args:
+        ws: write-only 工作表
+        values: 該列的儲存格數值
+        style_name: 已註冊的具名樣式名稱
+        
+    Returns:
+        可直接 ws.append 的儲存格列表
+    """
+    from openpyxl.cell import WriteOnlyCell
+    
+    row = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style_name
+        row.append(cell)
+    return row
+
+
+def _write_news_workbook(news_items: List[Dict[str, str]], filepath: str) -> None:
+    """
+    以 write-only 模式串流寫出新聞 Excel（不建立完整的儲存格物件樹）
+    
+    Args:
+        news_items: 新聞項目列表
+        filepath: 輸出檔案路徑
+    """
+    from openpyxl import Workbook
+    from openpyxl.styles import NamedStyle
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("新聞報告")
+    
+    # 以具名樣式註冊一次，每格只需指定樣式名稱，不必逐格組合 font/fill/alignment
+    # （NamedStyle 會綁定到各自的 workbook，只共用底層的樣式物件）
+    parts = _excel_style_parts()
+    header_style = NamedStyle(
+        name="news_header",
+        fill=parts["header_fill"],
+        font=parts["header_font"],
+        alignment=parts["header_alignment"],
+    )
+    body_style = NamedStyle(
+        name="news_body",
+        alignment=parts["body_alignment"],
+    )
+    wb.add_named_style(header_style)
+    wb.add_named_style(body_style)
+    
+    # write-only 模式下欄寬與凍結窗格必須在寫入第一列前設定
+    for col, width in EXCEL_COLUMN_WIDTHS.items():
+        ws.column_dimensions[col].width = width
+    
+    # 凍結首行
+    ws.freeze_panes = "A2"
+    
+    # 設定標題行
+    ws.append(_styled_row(ws, EXCEL_HEADERS, header_style.name))
+    
+    # 填入新聞資料（樣式在寫入時套用，不需事後逐格設定）
+    for idx, news in enumerate(news_items, start=1):
+        ws.append(_styled_row(ws, (
+            idx,
+            news.get('title', ''),
+            news.get('date', ''),
+            news.get('summary', ''),
+            news.get('link', ''),
+            news.get('source_doc', '')
+        ), body_style.name))
+    
+    # 先寫到同目錄的暫存檔再原子性替換，中途失敗不會留下不完整的 xlsx
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or ".", suffix=".xlsx.tmp")
+    os.close(fd)
+    try:
+        wb.save(tmp_path)
+        # mkstemp 建立的檔案權限為 0600，改回一般新檔案的權限，其他程序才能讀取 exports/
+        os.chmod(tmp_path, _NEW_FILE_MODE)
+        os.replace(tmp_path, filepath)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _stored_country(document_name: str) -> str:
+    """
+    以文件名稱查詢數據庫中已記錄的國家（name 索引），country 為空時改用 tags 第一個
+    
+    Args:
+        document_name: 文件名稱
+        
+    Returns:
+        國家名稱，查無或未知時回傳空字串
+    """
+    from news_store import news_store
+    country = ""  # 默認值改為空字符串
+    
+    try:
+        record = news_store.get_record_by_name(document_name)
+        if record:
+            country = record.get('country') or ''
+            # 如果是'未知'也視為空
+            if country == ' ':
+                country = ''
+            if not country:
+                tags = record.get('tags', [])
+                if tags:
+                    country = tags[0] if tags[0] != ' ' else ''
+    except Exception as e:
+        print(f"⚠️ 從數據庫獲取國家失敗: {e}")
+    
+    return country
+
+
 def generate_news_excel(
     document_name: str,
     document_content: str,
@@ -414,99 +785,19 @@ def generate_news_excel(
             }
         
         # 從數據庫記錄獲取國家（不再重複調用 LLM）
-        from news_store import news_store
-        country = ""  # 默認值改為空字符串
-        
-        # 嘗試通過文件名查詢數據庫獲取國家
-        try:
-            all_records = news_store.get_all_records()
-            for record in all_records:
-                if record.get('name') == document_name:
-                    country = record.get('country', '')
-                    # 如果是'未知'也視為空
-                    if country == ' ':
-                        country = ''
-                    break
-        except Exception as e:
-            print(f"⚠️ 從數據庫獲取國家失敗: {e}")
-        
-        # 如果數據庫中沒有找到，嘗試從 tags 中獲取
-        if not country:
-            try:
-                for record in all_records:
-                    if record.get('name') == document_name:
-                        tags = record.get('tags', [])
-                        if tags and len(tags) > 0:
-                            country = tags[0] if tags[0] != ' ' else ''
-                        break
-            except Exception as e:
-                print(f"⚠️ 從 tags 獲取國家失敗: {e}")
+        country = _stored_country(document_name)
         
         for item in news_items:
             item['source_doc'] = country
         
-        # 創建 Excel
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "新聞報告"
-        
-        # 設定標題行
-        headers = ["編號", "新聞標題", "發布時間", "新聞摘要", "新聞連結", "來源國家"]
-        ws.append(headers)
-        
-        # 設定標題樣式
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        for col in range(1, len(headers) + 1):
-            cell = ws.cell(row=1, column=col)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-        
-        # 填入新聞資料
-        for idx, news in enumerate(news_items, start=1):
-            ws.append([
-                idx,
-                news.get('title', ''),
-                news.get('date', ''),
-                news.get('summary', ''),
-                news.get('link', ''),
-                news.get('source_doc', '')
-            ])
-        
-        # 設定欄寬
-        column_widths = {
-            'A': 8,   # 編號
-            'B': 40,  # 標題
-            'C': 15,  # 時間
-            'D': 60,  # 摘要
-            'E': 50,  # 連結
-            'F': 20   # 來源國家
-        }
-        
-        for col, width in column_widths.items():
-            ws.column_dimensions[col].width = width
-        
-        # 設定資料行樣式
-        data_alignment = Alignment(vertical="top", wrap_text=True)
-        for row in range(2, len(news_items) + 2):
-            for col in range(1, len(headers) + 1):
-                cell = ws.cell(row=row, column=col)
-                cell.alignment = data_alignment
-        
-        # 凍結首行
-        ws.freeze_panes = "A2"
-        
         # 生成檔案名稱
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_doc_name = re.sub(r'[^\w\s-]', '', document_name)[:30]
+        safe_doc_name = _UNSAFE_FILENAME_RE.sub('', document_name)[:30]
         filename = f"新聞報告_{safe_doc_name}_{timestamp}.xlsx"
         filepath = os.path.join(output_dir, filename)
         
         # 儲存檔案
-        wb.save(filepath)
+        _write_news_workbook(news_items, filepath)
         
         return {
             "success": True,
@@ -535,29 +826,58 @@ def cleanup_old_exports(output_dir: str = "exports", max_age_days: int = 7):
         if not os.path.exists(output_dir):
             return
         
-        current_time = datetime.now()
+        now_ts = datetime.now().timestamp()
         max_age_seconds = max_age_days * 24 * 60 * 60
-        
-        for filename in os.listdir(output_dir):
-            filepath = os.path.join(output_dir, filename)
-            
-            if not os.path.isfile(filepath):
-                continue
-            
-            # 檢查檔案年齡
-            file_age = current_time.timestamp() - os.path.getmtime(filepath)
-            
-            if file_age > max_age_seconds:
-                try:
-                    os.remove(filepath)
-                    print(f"已刪除舊檔案: {filename}")
-                except Exception as e:
-                    print(f"刪除檔案失敗 {filename}: {e}")
+        failed = []
+        
+        # os.scandir 的 DirEntry 會快取檔案類型與 stat 結果，避免每個檔案多次 stat
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                # 不跟隨符號連結，只清理目錄中的一般檔案
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                
+                # 檢查檔案年齡
+                file_age = now_ts - entry.stat(follow_symlinks=False).st_mtime
+                
+                if file_age > max_age_seconds:
+                    try:
+                        os.remove(entry.path)
+                        print(f"已刪除舊檔案: {entry.name}")
+                    except OSError as e:
+                        failed.append(f"{entry.name} ({e})")
+        
+        if failed:
+            print(f"刪除檔案失敗 {len(failed)} 個: {', '.join(failed)}")
     
     except Exception as e:
         print(f"清理舊檔案時發生錯誤: {e}")
 
 
+def _parse_document_news(doc: Dict[str, str]) -> List[Dict[str, str]]:
+    """
+    解析單一文件的新聞並標註來源國家（供批次匯出並行呼叫，標題尚未翻譯）
+    
+    Args:
+        doc: 文件，包含 name 和 content
+        
+    Returns:
+        新聞列表（含 original_title，需再經 _fill_translations）
+    """
+    doc_name = doc.get('name', '未命名')
+    doc_content = doc.get('content', '')
+    
+    # 解析該文件的新聞（翻譯留到所有文件解析完後一次處理）
+    news_items = _parse_news_raw(doc_content)
+    
+    # 數據庫已記錄國家時直接沿用，否則以規則式判斷（URL 網域、名稱、內容關鍵字）
+    country = _stored_country(doc_name) or extract_country_from_content(doc_content, fallback_name=doc_name)
+    for item in news_items:
+        item['source_doc'] = country
+    
+    return news_items
+
+
 def generate_batch_news_excel(
     documents: List[Dict[str, str]],
     output_dir: str = "exports"
@@ -575,25 +895,21 @@ def generate_batch_news_excel(
     try:
         os.makedirs(output_dir, exist_ok=True)
         
-        # 收集所有新聞項目
+        # 收集所有新聞項目（各文件的解析以執行緒池並行，map 保持原始順序）
+        docs_with_content = [doc for doc in documents if doc.get('content', '')]
         all_news_items = []
         
-        for doc in documents:
-            doc_name = doc.get('name', '未命名')
-            doc_content = doc.get('content', '')
-            
-            if not doc_content:
-                continue
-            
-            # 解析該文件的新聞
-            news_items = parse_news_from_content(doc_content)
-            
-            # 使用 LLM 判斷國家
-            country = extract_country_from_content(doc_content, fallback_name=doc_name)
-            for item in news_items:
-                item['source_doc'] = country
-            
-            all_news_items.extend(news_items)
+        if len(docs_with_content) == 1:
+            # 只有一份文件時直接解析，省去建立執行緒池的成本
+            all_news_items.extend(_parse_document_news(docs_with_content[0]))
+        elif docs_with_content:
+            max_workers = min(BATCH_MAX_WORKERS, len(docs_with_content))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for news_items in executor.map(_parse_document_news, docs_with_content):
+                    all_news_items.extend(news_items)
+        
+        # 所有文件的標題合併去重後只呼叫一次翻譯 API
+        _fill_translations(all_news_items)
         
         if not all_news_items:
             return {
@@ -601,67 +917,13 @@ def generate_batch_news_excel(
                 "error": "沒有找到可匯出的新聞項目"
             }
         
-        # 創建 Excel
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "新聞報告"
-        
-        # 設定標題行
-        headers = ["編號", "新聞標題", "發布時間", "新聞摘要", "新聞連結", "來源國家"]
-        ws.append(headers)
-        
-        # 設定標題樣式
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        for col in range(1, len(headers) + 1):
-            cell = ws.cell(row=1, column=col)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-        
-        # 填入新聞資料
-        for idx, news in enumerate(all_news_items, start=1):
-            ws.append([
-                idx,
-                news.get('title', ''),
-                news.get('date', ''),
-                news.get('summary', ''),
-                news.get('link', ''),
-                news.get('source_doc', '')
-            ])
-        
-        # 設定欄寬
-        column_widths = {
-            'A': 8,   # 編號
-            'B': 40,  # 標題
-            'C': 15,  # 時間
-            'D': 60,  # 摘要
-            'E': 50,  # 連結
-            'F': 20   # 來源國家
-        }
-        
-        for col, width in column_widths.items():
-            ws.column_dimensions[col].width = width
-        
-        # 設定資料行樣式
-        data_alignment = Alignment(vertical="top", wrap_text=True)
-        for row in range(2, len(all_news_items) + 2):
-            for col in range(1, len(headers) + 1):
-                cell = ws.cell(row=row, column=col)
-                cell.alignment = data_alignment
-        
-        # 凍結首行
-        ws.freeze_panes = "A2"
-        
         # 生成檔案名稱
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"新聞報告_批次匯出_{timestamp}.xlsx"
         filepath = os.path.join(output_dir, filename)
         
         # 儲存檔案
-        wb.save(filepath)
+        _write_news_workbook(all_news_items, filepath)
         
         return {
             "success": True,
@@ -6,6 +6,54 @@ import sqlite3
 import json
 from pathlib import Path
 
+def _backfill_country_from_tags(cursor: sqlite3.Cursor) -> int:
+    """
+    以 SQLite JSON1 單一 UPDATE 從 tags 第一個元素回填 country
+    
+    Returns:
+        更新的記錄數
+    """
+    cursor.execute("""
+        UPDATE news_records
+        SET country = json_extract(tags, '$[0]')
+        WHERE (country IS NULL OR country = '')
+          AND tags IS NOT NULL
+          AND json_valid(tags)
+          AND json_type(tags) = 'array'
+          AND json_array_length(tags) > 0
+    """)
+    return cursor.rowcount
+
+
+def _backfill_country_from_tags_python(cursor: sqlite3.Cursor) -> int:
+    """
+    沒有 JSON1 時的備用路徑：在 Python 端解析 tags 後回填 country
+    
+    Returns:
+        更新的記錄數
+    """
+    # 空的 tags 直接在 SQL 端排除
+    cursor.execute("""
+        SELECT id, tags FROM news_records
+        WHERE (country IS NULL OR country = '')
+          AND tags IS NOT NULL AND tags != '' AND tags != '[]'
+    """)
+    records = cursor.fetchall()
+    
+    updates = []
+    for record_id, tags_json in records:
+        try:
+            tags = json.loads(tags_json)
+            if tags and len(tags) > 0:
+                updates.append((tags[0], record_id))
+        except Exception as e:
+            print(f"⚠️ 處理記錄 {record_id} 時出錯: {e}")
+    
+    # 單一語句準備一次、批次綁定所有參數
+    cursor.executemany("UPDATE news_records SET country = ? WHERE id = ?", updates)
+    return len(updates)
+
+
 def migrate_database():
     """執行數據庫遷移"""
     db_path = Path(__file__).parent / "news_records.db"
@@ -19,6 +67,9 @@ def migrate_database():
     cursor = conn.cursor()
     
     try:
+        # 整個遷移放在同一個交易中，最後只提交一次
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # 檢查字段是否已存在
         cursor.execute("PRAGMA table_info(news_records)")
         columns = {row[1] for row in cursor.fetchall()}
@@ -36,6 +87,7 @@ def migrate_database():
         
         if not fields_to_add:
             print("✅ 所有字段已存在，無需遷移")
+            conn.rollback()
             return
         
         # 添加字段
@@ -45,23 +97,11 @@ def migrate_database():
         
         # 從 tags 中提取 country 並更新現有記錄
         print("🔄 從 tags 提取 country 數據...")
-        cursor.execute("SELECT id, tags FROM news_records WHERE country IS NULL OR country = ''")
-        records = cursor.fetchall()
-        
-        updated_count = 0
-        for record_id, tags_json in records:
-            try:
-                if tags_json:
-                    tags = json.loads(tags_json)
-                    if tags and len(tags) > 0:
-                        country = tags[0]
-                        cursor.execute(
-                            "UPDATE news_records SET country = ? WHERE id = ?",
-                            (country, record_id)
-                        )
-                        updated_count += 1
-            except Exception as e:
-                print(f"⚠️ 處理記錄 {record_id} 時出錯: {e}")
+        try:
+            updated_count = _backfill_country_from_tags(cursor)
+        except sqlite3.OperationalError:
+            # SQLite 未編入 JSON1（json_extract 不存在），改用 Python 端解析
+            updated_count = _backfill_country_from_tags_python(cursor)
         
         conn.commit()
         print(f"✅ 遷移完成！更新了 {updated_count} 條記錄的 country 字段")
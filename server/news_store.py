@@ -2,13 +2,118 @@
 新聞記錄資料管理模組
 使用 SQLite 儲存 (持久化)
 """
+import atexit
 import sqlite3
 import json
 import os
+import queue
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 
+# orjson 為選用依賴：序列化/解析 tags 比標準 json 快數倍，未安裝時退回 json
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+def _dumps_json(obj: Any) -> str:
+    """序列化為 JSON 字串（保留非 ASCII 字元）"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _loads_json(text: str) -> Any:
+    """解析 JSON 字串"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# 連線層級的 SQLite 設定：WAL 讓讀寫互不阻塞，synchronous=NORMAL 在 WAL 下只於 checkpoint 時 fsync
+SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+SQLITE_CACHE_SIZE_KB = 8000
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+# 連線池大小（閒置連線上限），連線在行程生命週期內重複使用
+SQLITE_POOL_SIZE = 8
+
+# 固定的 SQL 語句：以相同文字送出時，連線的 statement cache 會直接重用已編譯的語句
+SQLITE_CACHED_STATEMENTS = 256
+
+_SQL_INSERT_RECORD = """
+INSERT OR REPLACE INTO news_records (
+    id, name, content, country, publish_date, url, created_at, updated_at,
+    types, source, message, status, preview, tags, pages, user_id
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# WHERE 條件與 idx_news_legacy_user_id 的部分索引條件一致，查詢規劃器會自行採用該索引
+_SQL_HAS_LEGACY_RECORDS = """
+SELECT EXISTS(
+    SELECT 1 FROM news_records
+    WHERE user_id IS NULL OR TRIM(user_id) = ''
+)
+"""
+_SQL_CLAIM_LEGACY_RECORDS = "UPDATE news_records SET user_id = ? WHERE user_id IS NULL OR TRIM(user_id) = ''"
+# LIMIT -1 表示不限筆數
+_SQL_SELECT_USER_RECORDS = "SELECT * FROM news_records WHERE user_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?"
+_SQL_SELECT_ALL_RECORDS = "SELECT * FROM news_records ORDER BY created_at DESC LIMIT ? OFFSET ?"
+
+# 列表用欄位：不含 content / preview / message 等大型文字欄位
+_LIST_COLUMNS = "id, name, country, publish_date, url, created_at, updated_at, types, source, status, tags, pages, user_id"
+_SQL_SELECT_USER_RECORD_SUMMARIES = (
+    f"SELECT {_LIST_COLUMNS} FROM news_records WHERE user_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?"
+)
+_SQL_SELECT_ALL_RECORD_SUMMARIES = (
+    f"SELECT {_LIST_COLUMNS} FROM news_records ORDER BY created_at DESC LIMIT ? OFFSET ?"
+)
+_SQL_SELECT_BY_NAME = "SELECT * FROM news_records WHERE name = ? ORDER BY created_at DESC LIMIT 1"
+_SQL_SELECT_USER_BY_ID = """
+SELECT * FROM news_records
+WHERE id = ?
+  AND (user_id = ? OR user_id IS NULL OR TRIM(user_id) = '')
+"""
+_SQL_SELECT_BY_ID = "SELECT * FROM news_records WHERE id = ?"
+_SQL_CLAIM_RECORD = "UPDATE news_records SET user_id = ? WHERE id = ?"
+_SQL_UPDATE_USER_TAGS = """
+UPDATE news_records
+SET tags = ?,
+    updated_at = ?,
+    user_id = CASE
+        WHEN user_id IS NULL OR TRIM(user_id) = '' THEN ?
+        ELSE user_id
+    END
+WHERE id = ?
+  AND (user_id = ? OR user_id IS NULL OR TRIM(user_id) = '')
+"""
+_SQL_UPDATE_TAGS = "UPDATE news_records SET tags = ?, updated_at = ? WHERE id = ?"
+_SQL_DELETE_USER_RECORD = """
+DELETE FROM news_records
+WHERE id = ?
+  AND (user_id = ? OR user_id IS NULL OR TRIM(user_id) = '')
+"""
+_SQL_DELETE_RECORD = "DELETE FROM news_records WHERE id = ?"
+_SQL_CLEAR_USER_RECORDS = """
+DELETE FROM news_records
+WHERE user_id = ? OR user_id IS NULL OR TRIM(user_id) = ''
+"""
+_SQL_CLEAR_ALL_RECORDS = "DELETE FROM news_records"
+_SQL_COUNT_RECORDS = "SELECT COUNT(*) FROM news_records"
+
+
+def _env_choice(name: str, default: str, allowed: set) -> str:
+    """讀取 PRAGMA 用的環境變數，值不合法時使用預設值（PRAGMA 無法參數化，必須白名單檢查）"""
+    value = os.getenv(name, default).strip().upper()
+    if value not in allowed:
+        print(f"[NewsStore] 警告：{name}={value} 不是有效設定，改用 {default}")
+        return default
+    return value
+
+
 class NewsStore:
     """
     SQLite 新聞記錄儲存
@@ -25,16 +130,63 @@ class NewsStore:
             self.db_path = os.path.join(os.path.dirname(__file__), db_path)
         else:
             self.db_path = db_path
+        
+        # 閒置連線池（LIFO：最近用過的連線頁面快取最熱）
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=SQLITE_POOL_SIZE)
             
         self._init_db()
         print(f"[NewsStore] SQLite 儲存已初始化: {self.db_path}")
 
     def _get_conn(self):
-        """獲取數據庫連接"""
-        conn = sqlite3.connect(self.db_path)
+        """建立新的數據庫連接（套用 WAL 與快取相關 PRAGMA）"""
+        # 連線會在不同的請求執行緒間重複使用（同一時間只屬於一個執行緒）
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+        )
         conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn)
         return conn
 
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        """
+        從連線池取得連線，池中沒有閒置連線時才新建
+        
+        正常結束時提交並放回連線池；發生例外時回滾並關閉該連線。
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._get_conn()
+        
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            finally:
+                conn.close()
+            raise
+        
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection) -> None:
+        """設定連線 PRAGMA；journal_mode / synchronous 可由 SQLITE_JOURNAL_MODE / SQLITE_SYNCHRONOUS 覆寫"""
+        journal_mode = _env_choice("SQLITE_JOURNAL_MODE", "WAL", SQLITE_JOURNAL_MODES)
+        synchronous = _env_choice("SQLITE_SYNCHRONOUS", "NORMAL", SQLITE_SYNCHRONOUS_MODES)
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+
     def _init_db(self):
         """初始化數據庫Schema"""
         schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
@@ -46,10 +198,9 @@ class NewsStore:
             schema_sql = f.read()
 
         try:
-            with self._get_conn() as conn:
+            with self._conn() as conn:
                 conn.executescript(schema_sql)
                 self._ensure_user_scope(conn)
-                conn.commit()
         except Exception as e:
             print(f"[NewsStore] DB 初始化失敗: {e}")
 
@@ -60,8 +211,27 @@ class NewsStore:
         if "user_id" not in columns:
             conn.execute("ALTER TABLE news_records ADD COLUMN user_id TEXT")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_news_user_id ON news_records(user_id)")
+        has_user_created_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_news_user_created'"
+        ).fetchone()
+        # 依用戶列出記錄（WHERE user_id = ? ORDER BY created_at DESC）直接走索引範圍掃描，不需排序
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_news_user_created ON news_records(user_id, created_at DESC)"
+        )
+        if not has_user_created_index:
+            # 新索引建立後收集一次統計資訊，讓查詢規劃器立即採用
+            conn.execute("ANALYZE news_records")
+        # 只收錄 legacy rows 的部分索引：沒有舊資料時 EXISTS 檢查不必掃描全表
+        # 索引鍵為 user_id，WHERE 條件所需欄位都在索引內（covering），查詢規劃器會自行選用；
+        # 舊版以 id 為鍵的索引不會被採用，一併移除
+        conn.execute("DROP INDEX IF EXISTS idx_news_legacy_user")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_news_legacy_user_id ON news_records(user_id) "
+            "WHERE user_id IS NULL OR TRIM(user_id) = ''"
+        )
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _normalize_user_id(user_id: Optional[str]) -> Optional[str]:
         if user_id is None:
             return None
@@ -74,123 +244,158 @@ class NewsStore:
 
     def add_record(self, record: Dict[str, Any], user_id: Optional[str] = None) -> bool:
         """新增新聞記錄"""
+        return self.add_records([record], user_id=user_id) > 0
+
+    def _record_params(self, record: Dict[str, Any], user_id: Optional[str], now: str) -> tuple:
+        """將記錄轉為 INSERT 參數"""
+        return (
+            record.get('id'),
+            record.get('name'),
+            record.get('content'),
+            record.get('country'),
+            record.get('publish_date'),
+            record.get('url'),
+            record.get('created_at', now),
+            now,
+            record.get('type'), # Maps to 'types' column
+            record.get('source'),
+            record.get('message'),
+            record.get('status'),
+            record.get('preview'),
+            _dumps_json(record.get('tags', [])),
+            record.get('pages'),
+            self._normalize_user_id(user_id or record.get('user_id')),
+        )
+
+    def add_records(self, records: List[Dict[str, Any]], user_id: Optional[str] = None) -> int:
+        """
+        批次新增新聞記錄：同一交易內以 executemany 寫入，只提交一次
+        
+        Args:
+            records: 新聞記錄列表（缺少 id 的記錄會被略過）
+            user_id: 記錄所屬用戶
+        
+        Returns:
+            寫入的記錄數（失敗時為 0）
+        """
         try:
-            record_id = record.get('id')
-            if not record_id:
-                return False
-            
-            # 準備插入數據
             now = datetime.now().isoformat()
-            resolved_user_id = self._normalize_user_id(user_id or record.get('user_id'))
+            valid_records = [record for record in records if record.get('id')]
+            if not valid_records:
+                return 0
             
-            # 處理 JSON 欄位
-            tags = json.dumps(record.get('tags', []), ensure_ascii=False)
+            params = [self._record_params(record, user_id, now) for record in valid_records]
             
-            sql = """
-            INSERT OR REPLACE INTO news_records (
-                id, name, content, country, publish_date, url, created_at, updated_at, 
-                types, source, message, status, preview, tags, pages, user_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
+            with self._conn() as conn:
+                conn.executemany(_SQL_INSERT_RECORD, params)
             
-            params = (
-                record_id,
-                record.get('name'),
-                record.get('content'),
-                record.get('country'),
-                record.get('publish_date'),
-                record.get('url'),
-                record.get('created_at', now),
-                now,
-                record.get('type'), # Maps to 'types' column
-                record.get('source'),
-                record.get('message'),
-                record.get('status'),
-                record.get('preview'),
-                tags,
-                record.get('pages'),
-                resolved_user_id,
-            )
-
-            with self._get_conn() as conn:
-                conn.execute(sql, params)
-                conn.commit()
-            
-            print(f"[NewsStore] 新增/更新記錄: {record.get('name')}")
-            return True
+            if len(valid_records) == 1:
+                print(f"[NewsStore] 新增/更新記錄: {valid_records[0].get('name')}")
+            else:
+                print(f"[NewsStore] 批次新增/更新 {len(valid_records)} 筆記錄")
+            return len(valid_records)
         except Exception as e:
             print(f"[NewsStore] 新增記錄失敗: {e}")
-            return False
+            return 0
 
-    def get_all_records(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """獲取新聞記錄（可依 user_id 隔離）"""
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        """將資料列轉為記錄 dict（還原 tags JSON，types 對應回 type）"""
+        r = dict(row)
+        # 還原 JSON
         try:
-            normalized_user_id = self._normalize_user_id(user_id)
-            with self._get_conn() as conn:
-                if normalized_user_id:
-                    # 兼容舊資料：首次讀取時把 legacy rows 併入當前用戶
-                    conn.execute(
-                        "UPDATE news_records SET user_id = ? WHERE user_id IS NULL OR TRIM(user_id) = ''",
-                        (normalized_user_id,),
-                    )
-                    conn.commit()
-                    cursor = conn.execute(
-                        "SELECT * FROM news_records WHERE user_id = ? ORDER BY created_at DESC",
-                        (normalized_user_id,),
-                    )
-                else:
-                    cursor = conn.execute("SELECT * FROM news_records ORDER BY created_at DESC")
-                rows = cursor.fetchall()
-                
-            results = []
-            for row in rows:
-                r = dict(row)
-                # 還原 JSON
-                try:
-                    r['tags'] = json.loads(r['tags']) if r['tags'] else []
-                except:
-                    r['tags'] = []
-                # Map 'types' back to 'type' if needed by frontend
-                r['type'] = r['types']
-                results.append(r)
-            return results
+            r['tags'] = _loads_json(r['tags']) if r['tags'] else []
+        except:
+            r['tags'] = []
+        # Map 'types' back to 'type' if needed by frontend
+        r['type'] = r['types']
+        return r
+
+    def get_all_records(self, user_id: Optional[str] = None, include_content: bool = True) -> List[Dict[str, Any]]:
+        """
+        獲取新聞記錄（可依 user_id 隔離）
+        
+        Args:
+            user_id: 記錄所屬用戶
+            include_content: False 時只讀取列表所需欄位（不含 content / preview / message），
+                完整內容改由 get_record_by_id 取得
+        """
+        try:
+            return list(self.iter_records(user_id, include_content=include_content))
         except Exception as e:
             print(f"[NewsStore] 獲取記錄失敗: {e}")
             return []
 
+    def iter_records(
+        self,
+        user_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_content: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐筆產生新聞記錄（依 created_at 由新到舊），不預先載入整個結果集
+        
+        Args:
+            user_id: 記錄所屬用戶
+            limit: 最多回傳筆數，None 表示不限
+            offset: 略過的筆數
+            include_content: False 時只讀取列表所需欄位
+
+        錯誤不在此攔截：呼叫端可能已開始輸出，必須能分辨「沒有記錄」與「讀取中斷」
+        """
+        normalized_user_id = self._normalize_user_id(user_id)
+        if include_content:
+            user_sql, all_sql = _SQL_SELECT_USER_RECORDS, _SQL_SELECT_ALL_RECORDS
+        else:
+            user_sql, all_sql = _SQL_SELECT_USER_RECORD_SUMMARIES, _SQL_SELECT_ALL_RECORD_SUMMARIES
+        page = (-1 if limit is None else limit, offset)
+        if normalized_user_id:
+            # 兼容舊資料：首次讀取時把 legacy rows 併入當前用戶
+            # 先以唯讀 EXISTS 檢查，沒有 legacy rows 時不進入寫入交易；
+            # 併入在獨立交易中完成，避免逐筆讀取期間持有寫鎖
+            with self._conn() as conn:
+                if conn.execute(_SQL_HAS_LEGACY_RECORDS).fetchone()[0]:
+                    conn.execute(_SQL_CLAIM_LEGACY_RECORDS, (normalized_user_id,))
+        with self._conn() as conn:
+            if normalized_user_id:
+                cursor = conn.execute(user_sql, (normalized_user_id, *page))
+            else:
+                cursor = conn.execute(all_sql, page)
+            for row in cursor:
+                yield self._row_to_record(row)
+
+    def get_record_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """根據文件名稱獲取最新一筆新聞記錄（走 name 索引，不掃描全表）"""
+        try:
+            with self._conn() as conn:
+                cursor = conn.execute(_SQL_SELECT_BY_NAME, (name,))
+                row = cursor.fetchone()
+            
+            if row:
+                return self._row_to_record(row)
+            return None
+        except Exception as e:
+            print(f"[NewsStore] 獲取記錄失敗: {e}")
+            return None
+
     def get_record_by_id(self, record_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """根據 ID 獲取新聞記錄（可依 user_id 隔離）"""
         try:
             normalized_user_id = self._normalize_user_id(user_id)
-            with self._get_conn() as conn:
+            with self._conn() as conn:
                 if normalized_user_id:
-                    cursor = conn.execute(
-                        """
-                        SELECT * FROM news_records
-                        WHERE id = ?
-                          AND (user_id = ? OR user_id IS NULL OR TRIM(user_id) = '')
-                        """,
-                        (record_id, normalized_user_id),
-                    )
+                    cursor = conn.execute(_SQL_SELECT_USER_BY_ID, (record_id, normalized_user_id))
                 else:
-                    cursor = conn.execute("SELECT * FROM news_records WHERE id = ?", (record_id,))
+                    cursor = conn.execute(_SQL_SELECT_BY_ID, (record_id,))
                 row = cursor.fetchone()
                 
             if row:
-                r = dict(row)
+                r = self._row_to_record(row)
                 if normalized_user_id and self._is_legacy_user_id(r.get("user_id")):
-                    with self._get_conn() as conn:
-                        conn.execute(
-                            "UPDATE news_records SET user_id = ? WHERE id = ?",
-                            (normalized_user_id, record_id),
-                        )
-                        conn.commit()
+                    with self._conn() as conn:
+                        conn.execute(_SQL_CLAIM_RECORD, (normalized_user_id, record_id))
                     r["user_id"] = normalized_user_id
-                try:
-                    r['tags'] = json.loads(r['tags']) if r['tags'] else []
-                except:
-                    r['tags'] = []
-                r['type'] = r['types']
                 return r
             return None
         except Exception as e:
@@ -200,33 +405,19 @@ class NewsStore:
     def update_tags(self, record_id: str, tags: List[str], user_id: Optional[str] = None) -> bool:
         """更新記錄的標籤（可依 user_id 隔離）"""
         try:
-            tags_json = json.dumps(tags, ensure_ascii=False)
+            tags_json = _dumps_json(tags)
             updated_at = datetime.now().isoformat()
             normalized_user_id = self._normalize_user_id(user_id)
             
-            with self._get_conn() as conn:
+            with self._conn() as conn:
                 if normalized_user_id:
                     cursor = conn.execute(
-                        """
-                        UPDATE news_records
-                        SET tags = ?,
-                            updated_at = ?,
-                            user_id = CASE
-                                WHEN user_id IS NULL OR TRIM(user_id) = '' THEN ?
-                                ELSE user_id
-                            END
-                        WHERE id = ?
-                          AND (user_id = ? OR user_id IS NULL OR TRIM(user_id) = '')
-                        """,
+                        _SQL_UPDATE_USER_TAGS,
                         (tags_json, updated_at, normalized_user_id, record_id, normalized_user_id),
                     )
                 else:
-                    cursor = conn.execute(
-                        "UPDATE news_records SET tags = ?, updated_at = ? WHERE id = ?", 
-                        (tags_json, updated_at, record_id)
-                    )
+                    cursor = conn.execute(_SQL_UPDATE_TAGS, (tags_json, updated_at, record_id))
                 if cursor.rowcount > 0:
-                    conn.commit()
                     print(f"[NewsStore] 更新標籤: {record_id}")
                     return True
                 return False
@@ -238,20 +429,12 @@ class NewsStore:
         """刪除新聞記錄（可依 user_id 隔離）"""
         try:
             normalized_user_id = self._normalize_user_id(user_id)
-            with self._get_conn() as conn:
+            with self._conn() as conn:
                 if normalized_user_id:
-                    cursor = conn.execute(
-                        """
-                        DELETE FROM news_records
-                        WHERE id = ?
-                          AND (user_id = ? OR user_id IS NULL OR TRIM(user_id) = '')
-                        """,
-                        (record_id, normalized_user_id),
-                    )
+                    cursor = conn.execute(_SQL_DELETE_USER_RECORD, (record_id, normalized_user_id))
                 else:
-                    cursor = conn.execute("DELETE FROM news_records WHERE id = ?", (record_id,))
+                    cursor = conn.execute(_SQL_DELETE_RECORD, (record_id,))
                 if cursor.rowcount > 0:
-                    conn.commit()
                     print(f"[NewsStore] 刪除記錄: {record_id}")
                     return True
                 return False
@@ -263,29 +446,35 @@ class NewsStore:
         """清空新聞記錄（可依 user_id 隔離）"""
         try:
             normalized_user_id = self._normalize_user_id(user_id)
-            with self._get_conn() as conn:
+            with self._conn() as conn:
                 if normalized_user_id:
-                    conn.execute(
-                        """
-                        DELETE FROM news_records
-                        WHERE user_id = ? OR user_id IS NULL OR TRIM(user_id) = ''
-                        """,
-                        (normalized_user_id,),
-                    )
+                    conn.execute(_SQL_CLEAR_USER_RECORDS, (normalized_user_id,))
                 else:
-                    conn.execute("DELETE FROM news_records")
-                conn.commit()
+                    conn.execute(_SQL_CLEAR_ALL_RECORDS)
             print("[NewsStore] 已清空記錄")
             return True
         except Exception as e:
             print(f"[NewsStore] 清空記錄失敗: {e}")
             return False
             
+    def close(self) -> None:
+        """關閉連線池；關閉前執行 PRAGMA optimize 讓 SQLite 更新需要的統計資訊"""
+        try:
+            with self._conn() as conn:
+                conn.execute("PRAGMA optimize")
+        except Exception as e:
+            print(f"[NewsStore] PRAGMA optimize 失敗: {e}")
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
     def count_records(self) -> int:
         """獲取記錄數量"""
         try:
-            with self._get_conn() as conn:
-                cursor = conn.execute("SELECT COUNT(*) FROM news_records")
+            with self._conn() as conn:
+                cursor = conn.execute(_SQL_COUNT_RECORDS)
                 return cursor.fetchone()[0]
         except Exception:
             return 0
@@ -293,3 +482,4 @@ class NewsStore:
 
 # 全域實例
 news_store = NewsStore()
+atexit.register(news_store.close)
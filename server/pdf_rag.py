@@ -1,7 +1,13 @@
+import hashlib
 import io
 import os
+import sqlite3
+import threading
 import uuid
-from typing import List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 try:
     import PyPDF2
@@ -15,39 +21,135 @@ except Exception:
 
 from openai import OpenAI
 
-# Simple in-memory vector store: doc_id -> list of {chunk_id, text, embedding}
+# Simple in-memory vector store, one struct-of-arrays entry per document:
+# doc_id -> {"ids": [chunk_id], "texts": [text], "codes": int8 (N, D), "scales": float32 (N,)}
+# codes * scales are the L2-normalized embeddings (None when embeddings are unavailable)
 VECTOR_STORE = {}
 
+# Stored documents are also persisted to pdf_rag's own SQLite file (PDF_VECTOR_DB overrides the
+# path), kept apart from the news records database
+DEFAULT_PDF_VECTOR_DB = Path(__file__).parent / "pdf_vectors.db"
+_SQL_CREATE_VECTORS = """
+CREATE TABLE IF NOT EXISTS pdf_vectors (
+    doc_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    chunk_id TEXT,
+    text TEXT,
+    embedding BLOB,
+    scale REAL,
+    PRIMARY KEY (doc_id, idx)
+) WITHOUT ROWID
+"""
+_SQL_DELETE_VECTORS = "DELETE FROM pdf_vectors WHERE doc_id = ?"
+_SQL_INSERT_VECTOR = "INSERT INTO pdf_vectors (doc_id, idx, chunk_id, text, embedding, scale) VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_SELECT_VECTORS = "SELECT chunk_id, text, embedding, scale FROM pdf_vectors WHERE doc_id = ? ORDER BY idx"
+
+# Parsed PDF text cache keyed by content hash (in memory only, so it stays bounded)
+PDF_TEXT_MEMORY_CACHE_SIZE = 32
+_pdf_text_cache: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+_pdf_text_cache_lock = threading.Lock()
+
+# PyPDF2 parsing is pure Python and holds the GIL, so large PDFs are split across processes
+PDF_PARALLEL_MIN_PAGES = 64
+PDF_PAGES_PER_WORKER_MIN = 16
+
+# Embedding requests are split into batches and sent concurrently (network-bound)
+EMBEDDING_BATCH_SIZE = 96
+EMBEDDING_MAX_WORKERS = 4
+
+
+def _pdf_cache_key(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _load_cached_pdf_text(key: str) -> Optional[Tuple[str, int]]:
+    with _pdf_text_cache_lock:
+        cached = _pdf_text_cache.get(key)
+        if cached is not None:
+            _pdf_text_cache.move_to_end(key)
+        return cached
+
+
+def _store_cached_pdf_text(key: str, result: Tuple[str, int]) -> None:
+    with _pdf_text_cache_lock:
+        _pdf_text_cache[key] = result
+        _pdf_text_cache.move_to_end(key)
+        while len(_pdf_text_cache) > PDF_TEXT_MEMORY_CACHE_SIZE:
+            _pdf_text_cache.popitem(last=False)
+
 
 def extract_text_from_pdf_bytes(data: bytes) -> Tuple[str, int]:
+    key = _pdf_cache_key(data)
+    cached = _load_cached_pdf_text(key)
+    if cached is not None:
+        return cached
+    result = _extract_text_uncached(data)
+    _store_cached_pdf_text(key, result)
+    return result
+
+
+def _extract_text_uncached(data: bytes) -> Tuple[str, int]:
     if PyPDF2 is None:
         raise RuntimeError("PyPDF2 未安裝，無法解析 PDF。請先安裝 PyPDF2。")
     reader = PyPDF2.PdfReader(io.BytesIO(data))
     pages = len(reader.pages)
+    workers = min(os.cpu_count() or 1, pages // PDF_PAGES_PER_WORKER_MIN)
+    if pages < PDF_PARALLEL_MIN_PAGES or workers < 2:
+        texts = _extract_pages(reader, 0, pages)
+    else:
+        texts = _extract_pages_parallel(data, pages, workers)
+    return "\n\n".join(texts), pages
+
+
+def _extract_pages(reader, start: int, end: int) -> List[str]:
     texts = []
-    for p in reader.pages:
+    for i in range(start, end):
         try:
-            texts.append(p.extract_text() or "")
+            texts.append(reader.pages[i].extract_text() or "")
         except Exception:
             texts.append("")
-    return "\n\n".join(texts), pages
+    return texts
+
+
+def _extract_range(data: bytes, start: int, end: int) -> List[str]:
+    """Process-pool worker: re-open the PDF and extract pages [start, end)."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return _extract_pages(reader, start, end)
+
+
+def _extract_pages_parallel(data: bytes, pages: int, workers: int) -> List[str]:
+    step = -(-pages // workers)
+    bounds = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_range, data, start, end) for start, end in bounds]
+            return [text for future in futures for text in future.result()]
+    except Exception as e:
+        # Process pools can be unavailable (restricted sandboxes); fall back to a serial pass
+        print(f"[pdf_rag] 平行解析 PDF 失敗，改為逐頁解析: {e}")
+        return _extract_range(data, 0, pages)
 
 
 def chunk_text(text: str, chunk_size: int = 1200, overlap: int = 200) -> List[str]:
+    if not 0 <= overlap < chunk_size:
+        raise ValueError("chunk_text 需要 0 <= overlap < chunk_size")
     if not text:
         return []
+    length = len(text)
+    step = chunk_size - overlap
     chunks = []
     start = 0
-    length = len(text)
-    while start < length:
+    while True:
         end = min(start + chunk_size, length)
-        chunk = text[start:end].strip()
+        chunk = text[start:end]
+        # Only pay for strip() when the slice actually has whitespace at an edge
+        if chunk[0].isspace() or chunk[-1].isspace():
+            chunk = chunk.strip()
         if chunk:
             chunks.append(chunk)
-        start = end - overlap
-        if start < 0:
-            start = 0
-    return chunks
+        if end >= length:
+            return chunks
+        start += step
 
 
 def get_openai_client() -> OpenAI:
@@ -64,18 +166,119 @@ def compute_embeddings(client: OpenAI, texts: List[str]) -> List[List[float]]:
     if client is None:
         # No API key available — return empty embeddings placeholders
         return [[] for _ in texts]
+    batches = [texts[i:i + EMBEDDING_BATCH_SIZE] for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)]
+    if len(batches) == 1:
+        return _embed_batch(client, model, texts)
+    with ThreadPoolExecutor(max_workers=min(EMBEDDING_MAX_WORKERS, len(batches))) as executor:
+        results = executor.map(lambda batch: _embed_batch(client, model, batch), batches)
+        return [embedding for batch_result in results for embedding in batch_result]
+
+
+def _embed_batch(client: OpenAI, model: str, texts: List[str]) -> List[List[float]]:
     resp = client.embeddings.create(model=model, input=texts)
-    return [item.embedding for item in resp.data]
+    # The API reports each item's position; do not rely on response order
+    return [item.embedding for item in sorted(resp.data, key=lambda item: item.index)]
 
 
-def cosine_similarity(a, b):
+def cosine_similarity(a, b, prenormalized: bool = False):
     if np is None:
         raise RuntimeError("numpy 未安裝，無法計算相似度。請先安裝 numpy。")
-    a = np.array(a, dtype=float)
-    b = np.array(b, dtype=float)
-    if np.linalg.norm(a) == 0 or np.linalg.norm(b) == 0:
+    # asarray skips the copy when the caller already passes float arrays
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if prenormalized:
+        return float(a @ b)
+    norm_a = np.linalg.norm(a)
+    norm_b = np.linalg.norm(b)
+    if norm_a == 0 or norm_b == 0:
         return 0.0
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+    return float(a @ b / (norm_a * norm_b))
+
+
+def _normalized_matrix(embeddings: List[List[float]]):
+    """Stack embeddings into an L2-normalized float32 matrix; None if they are missing or ragged."""
+    if np is None or not embeddings or not embeddings[0]:
+        return None
+    try:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+    except ValueError:
+        return None
+    if matrix.ndim != 2:
+        return None
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Zero vectors stay zero so they score 0, matching cosine_similarity
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _quantize_rows(matrix):
+    """Symmetric per-row int8 quantization: row ~= codes * scale."""
+    max_abs = np.abs(matrix).max(axis=1)
+    scales = (max_abs / 127.0).astype(np.float32)
+    safe = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.rint(matrix / safe[:, None]).astype(np.int8)
+    return codes, scales
+
+
+def _vector_db() -> sqlite3.Connection:
+    # Read at call time: .env may be loaded after this module is imported
+    conn = sqlite3.connect(os.getenv("PDF_VECTOR_DB") or DEFAULT_PDF_VECTOR_DB)
+    conn.row_factory = sqlite3.Row
+    conn.execute(_SQL_CREATE_VECTORS)
+    return conn
+
+
+def _persist_vectors(doc_id: str, entry: dict) -> None:
+    codes, scales = entry["codes"], entry["scales"]
+    rows = [
+        (
+            doc_id,
+            idx,
+            chunk_id,
+            text,
+            codes[idx].tobytes() if codes is not None else None,
+            float(scales[idx]) if scales is not None else None,
+        )
+        for idx, (chunk_id, text) in enumerate(zip(entry["ids"], entry["texts"]))
+    ]
+    try:
+        conn = _vector_db()
+        try:
+            # One transaction per document: a reader never sees half of its chunks
+            with conn:
+                conn.execute(_SQL_DELETE_VECTORS, (doc_id,))
+                conn.executemany(_SQL_INSERT_VECTOR, rows)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[pdf_rag] 向量寫入失敗: {e}")
+
+
+def _load_vectors(doc_id: str) -> Optional[dict]:
+    try:
+        conn = _vector_db()
+        try:
+            rows = conn.execute(_SQL_SELECT_VECTORS, (doc_id,)).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[pdf_rag] 向量讀取失敗: {e}")
+        return None
+    if not rows:
+        return None
+    codes = scales = None
+    blobs = [row["embedding"] for row in rows]
+    if np is not None and all(blobs):
+        codes = np.frombuffer(b"".join(blobs), dtype=np.int8).reshape(len(blobs), -1)
+        scales = np.array([row["scale"] for row in rows], dtype=np.float32)
+    entry = {
+        "ids": [row["chunk_id"] for row in rows],
+        "texts": [row["text"] for row in rows],
+        "codes": codes,
+        "scales": scales,
+    }
+    VECTOR_STORE[doc_id] = entry
+    return entry
 
 
 def store_pdf_bytes(file_bytes: bytes, filename: str):
@@ -85,22 +288,41 @@ def store_pdf_bytes(file_bytes: bytes, filename: str):
     chunks = chunk_text(text)
     embeddings = compute_embeddings(client, chunks) if chunks else []
     doc_id = str(uuid.uuid4())
-    items = []
-    for idx, (chunk, emb) in enumerate(zip(chunks, embeddings)):
-        items.append({"chunk_id": f"{doc_id}-{idx}", "text": chunk, "embedding": emb})
-    VECTOR_STORE[doc_id] = items
+    count = min(len(chunks), len(embeddings))
+    matrix = _normalized_matrix(embeddings[:count])
+    codes, scales = _quantize_rows(matrix) if matrix is not None else (None, None)
+    entry = {
+        "ids": [f"{doc_id}-{idx}" for idx in range(count)],
+        "texts": chunks[:count],
+        "codes": codes,
+        "scales": scales,
+    }
+    VECTOR_STORE[doc_id] = entry
+    _persist_vectors(doc_id, entry)
     return {"id": doc_id, "name": filename, "type": "PDF", "pages": pages}
 
 
 def retrieve_similar(doc_id: str, query: str, top_k: int = 3) -> List[dict]:
+    if np is None:
+        raise RuntimeError("numpy 未安裝，無法計算相似度。請先安裝 numpy。")
     client = get_openai_client()
-    items = VECTOR_STORE.get(doc_id) or []
-    if not items:
+    entry = VECTOR_STORE.get(doc_id) or _load_vectors(doc_id)
+    if not entry or not entry["ids"] or top_k <= 0:
         return []
+    ids, texts, codes = entry["ids"], entry["texts"], entry["codes"]
     q_emb = compute_embeddings(client, [query])[0]
-    scored = []
-    for it in items:
-        score = cosine_similarity(q_emb, it["embedding"])
-        scored.append((score, it))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [it for _, it in scored[:top_k]]
+    q = np.asarray(q_emb, dtype=np.float32)
+    q_norm = float(np.linalg.norm(q)) if q.size else 0.0
+    if codes is None or q.ndim != 1 or q.shape[0] != codes.shape[1] or q_norm == 0:
+        # Every score would be 0; keep the original stored order
+        top_idx = range(min(top_k, len(ids)))
+    else:
+        scores = (codes @ (q / q_norm)) * entry["scales"]
+        if top_k < len(ids):
+            top_idx = np.argpartition(-scores, top_k - 1)[:top_k]
+            # argpartition is unordered; sort only the k winners (stable on ties by position)
+            top_idx = np.sort(top_idx)
+            top_idx = top_idx[np.argsort(-scores[top_idx], kind="stable")]
+        else:
+            top_idx = np.argsort(-scores, kind="stable")
+    return [{"chunk_id": ids[i], "text": texts[i]} for i in top_idx]
@@ -1,28 +1,64 @@
 import hashlib
 import io
-import math
+import json
 import os
+import tempfile
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from agno.knowledge.chunking.fixed import FixedSizeChunking
+import numpy as np
 from agno.knowledge.document.base import Document
 from agno.knowledge.embedder.openai import OpenAIEmbedder
 from agno.knowledge.reader.pdf_reader import PDFReader
 from agno.knowledge.reader.text_reader import TextReader
 
+from content_chunking import ContentDefinedChunking
+from content_hash import content_digest, text_digest
+
 try:
     from pypdf import PdfReader
 except Exception:  # pragma: no cover - handled at runtime
     PdfReader = None
 
+try:
+    import faiss
+except Exception:  # pragma: no cover - optional dependency
+    faiss = None
 
-@dataclass
-class IndexedChunk:
-    text: str
-    embedding: List[float]
-    metadata: Dict[str, Any] = field(default_factory=dict)
+# With faiss installed, large corpora are searched through an index instead of a full matmul:
+# exact inner product (= cosine on unit vectors) first, graph ANN (HNSW) beyond the second threshold
+FAISS_MIN_CHUNKS = 10_000
+FAISS_HNSW_MIN_CHUNKS = 50_000
+FAISS_HNSW_M = 32
+FAISS_HNSW_EF_SEARCH = 64
+
+# search() result caches, both cleared whenever the indexed documents change:
+# exact query string, and semantic (a new query whose embedding is this close to a cached one)
+SEARCH_CACHE_SIZE = 256
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+# Query embeddings keyed by (model, query); unlike the result caches these survive index changes
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Chunk embeddings keyed by sha256(text) + model, so re-indexing unchanged text skips the API
+EMBEDDING_CACHE_SIZE = 8192
+
+# Chunks missing from the cache are embedded in batched API requests (well under the
+# 2048-input / token limits per request); per-text calls in a thread pool are the fallback
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_FALLBACK_WORKERS = 8
+
+# Hashing, page counting and PDF parsing of uploads run on a shared pool (index_many fans out
+# whole batches); embedding and storing stay on the calling thread
+INDEX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Stored embeddings are int8 codes with a per-row scale (a quarter of float32's memory and scan
+# bandwidth); dense scoring upcasts this many rows at a time into a float32 buffer for the matvec
+SCORE_BLOCK_ROWS = 4096
 
 
 @dataclass
@@ -32,19 +68,53 @@ class StoredDocument:
     type: str
     pages: Optional[int] = None
     preview: str = ""
-    chunks: List[IndexedChunk] = field(default_factory=list)
+    # Chunks as parallel arrays: embeddings[i] * scales[i] ~= the unit vector of texts[i] (zeros
+    # when has_embedding[i] is False, e.g. no embedder configured)
+    texts: List[str] = field(default_factory=list)
+    metadata: List[Dict[str, Any]] = field(default_factory=list)
+    embeddings: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.int8))
+    scales: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    has_embedding: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=bool))
     content_hash: Optional[str] = None
     status: str = "indexed"
     message: str = ""
 
 
 class RagStore:
-    def __init__(self) -> None:
+    def __init__(self, index_dir: Optional[str] = None) -> None:
         self.docs: Dict[str, StoredDocument] = {}
         self._embedder: Optional[OpenAIEmbedder] = None
-        self._chunker = FixedSizeChunking(chunk_size=1200, overlap=200)
-        self._pdf_reader = PDFReader(chunking_strategy=self._chunker)
-        self._text_reader = TextReader(chunking_strategy=self._chunker)
+        # Content-defined boundaries: an edit only re-chunks (and re-embeds) the text around it. The
+        # chunker keeps no per-call state, so readers on pool threads share it
+        self._chunker = ContentDefinedChunking(min_size=800, avg_size=1200, max_size=2000)
+        # (first row, document) of every document embedded with the common dimension, rebuilt lazily
+        # on the first search after a change; codes are scored in place, so loaded mmaps stay mapped
+        self._dense_docs: List[Tuple[int, StoredDocument]] = []
+        self._dim = 0
+        self._chunk_index: List[Tuple[StoredDocument, int]] = []
+        self._has_embedding = np.empty(0, dtype=bool)
+        self._dense_rows: Optional[np.ndarray] = None
+        self._faiss_index = None
+        # Lowercased chunk texts and character -> chunk rows postings, built on the first lexical search
+        self._lower_texts: Optional[List[str]] = None
+        self._char_postings: Dict[str, np.ndarray] = {}
+        # Full rebuild pending (start-up, or a document was replaced); otherwise documents added since
+        # the last search are appended to the index in place
+        self._index_dirty = True
+        self._appended_docs: List[StoredDocument] = []
+        self._search_cache: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self._semantic_vectors = np.empty((0, 0), dtype=np.float32)
+        self._semantic_entries: List[Tuple[tuple, List[Dict[str, Any]]]] = []
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_embedding_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        # content hash -> doc_id, so re-uploads are detected without scanning every document
+        self._by_hash: Dict[str, str] = {}
+        # Documents are persisted per doc (<key>.json + <key>.npy codes) and reloaded here, so a
+        # restart neither loses the index nor re-embeds re-uploaded files
+        self._index_dir = index_dir
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if index_dir:
+            self._load_index()
 
     def _get_embedder(self) -> Optional[OpenAIEmbedder]:
         if self._embedder is not None:
@@ -57,77 +127,422 @@ class RagStore:
         return self._embedder
 
     def _hash_text(self, text: str) -> str:
-        return hashlib.md5(text.encode("utf-8")).hexdigest()
+        return text_digest(text)
 
     def _hash_bytes(self, data: bytes) -> str:
-        return hashlib.md5(data).hexdigest()
+        return content_digest(data)
 
     def _find_by_hash(self, content_hash: str) -> Optional[StoredDocument]:
-        for doc in self.docs.values():
-            if doc.content_hash == content_hash:
-                return doc
+        doc = self.docs.get(self._by_hash.get(content_hash, ""))
+        # index_inline_text may have re-indexed the doc_id with different content since
+        if doc is not None and doc.content_hash == content_hash:
+            return doc
         return None
 
+    def _register_hash(self, content_hash: str, doc_id: str) -> None:
+        # The first document indexed with this content stays the canonical one while it still matches
+        if self._find_by_hash(content_hash) is None:
+            self._by_hash[content_hash] = doc_id
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=INDEX_WORKERS, thread_name_prefix="rag-index")
+        return self._pool
+
     def _count_pdf_pages(self, data: bytes) -> Optional[int]:
         if PdfReader is None:
             return None
         try:
-            return len(PdfReader(io.BytesIO(data)).pages)
+            reader = PdfReader(io.BytesIO(data))
         except Exception:
             return None
+        try:
+            # /Count on the page-tree root; len(reader.pages) would load every page object first
+            count = reader.trailer["/Root"]["/Pages"]["/Count"]
+            if isinstance(count, int) and count >= 0:
+                return int(count)
+        except Exception:
+            pass
+        try:
+            return len(reader.pages)
+        except Exception:
+            return None
+
+    def _embedding_key(self, embedder: OpenAIEmbedder, text: str) -> str:
+        # Namespaced by model so switching OPENAI_EMBEDDING_MODEL never reuses stale vectors
+        return f"{hashlib.sha256(text.encode('utf-8')).hexdigest()}:{getattr(embedder, 'id', '')}"
+
+    def _embed_chunks(self, embedder: Optional[OpenAIEmbedder], texts: List[str]) -> List[np.ndarray]:
+        """Unit-length embeddings, reusing earlier results for identical text."""
+        if embedder is None:
+            return [_as_vector([]) for _ in texts]
+        keys = [self._embedding_key(embedder, text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                found[key] = cached
+            else:
+                missing.setdefault(key, text)
+
+        if missing:
+            vectors = _embed_texts(embedder, list(missing.values()))
+            for key, values in zip(missing, vectors):
+                embedding = np.array(values or [], dtype=np.float32)
+                norm = float(np.linalg.norm(embedding)) if embedding.size else 0.0
+                if norm > 0:
+                    embedding /= norm
+                # Shared between chunks with the same text, so it must never be modified in place
+                embedding.setflags(write=False)
+                found[key] = embedding
+                # A failed request returns no vector; retry it on the next indexing instead of caching it
+                if embedding.size:
+                    self._embedding_cache[key] = embedding
+            while len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+
+        return [found[key] for key in keys]
+
+    def _embed_query(self, embedder: OpenAIEmbedder, query: str) -> np.ndarray:
+        key = (getattr(embedder, "id", ""), query)
+        cached = self._query_embedding_cache.get(key)
+        if cached is not None:
+            self._query_embedding_cache.move_to_end(key)
+            return cached
+        embedding = _as_vector(embedder.get_embedding(query))
+        # A failed request returns no vector; retry it on the next search instead of caching it
+        if embedding.size:
+            embedding.setflags(write=False)
+            self._query_embedding_cache[key] = embedding
+            if len(self._query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embedding_cache.popitem(last=False)
+        return embedding
 
     def _index_documents(self, stored: StoredDocument, docs: List[Document]) -> None:
         embedder = self._get_embedder()
-        chunks: List[IndexedChunk] = []
-        for doc in docs:
-            text = (doc.content or "").strip()
-            if not text:
+        pending = [(doc, (doc.content or "").strip()) for doc in docs]
+        pending = [(doc, text) for doc, text in pending if text]
+        texts = [text for _, text in pending]
+        vectors = self._embed_chunks(embedder, texts)
+        dim = next((vector.shape[0] for vector in vectors if vector.size), 0)
+        unit = np.zeros((len(texts), dim), dtype=np.float32)
+        has_embedding = np.zeros(len(texts), dtype=bool)
+        for i, vector in enumerate(vectors):
+            if dim and vector.shape == (dim,):
+                unit[i] = vector
+                has_embedding[i] = True
+        embeddings, scales = _quantize_rows(unit)
+
+        metadata: List[Dict[str, Any]] = []
+        for doc, _ in pending:
+            meta = dict(doc.meta_data or {})
+            meta["doc_id"] = stored.id
+            meta["doc_name"] = stored.name
+            metadata.append(meta)
+
+        stored.texts = texts
+        stored.metadata = metadata
+        stored.embeddings = embeddings
+        stored.scales = scales
+        stored.has_embedding = has_embedding
+        if texts:
+            stored.preview = texts[0][:400]
+
+    def _put_doc(self, stored: StoredDocument) -> None:
+        if stored.id in self.docs:
+            # Replaced rows sit mid-index (dict order keeps the old position), so rebuild
+            self._index_dirty = True
+            self._appended_docs = []
+        elif not self._index_dirty:
+            self._appended_docs.append(stored)
+        self.docs[stored.id] = stored
+        self._clear_search_cache()
+        if self._index_dir:
+            self._save_doc(stored)
+
+    def _doc_paths(self, doc_id: str) -> Tuple[str, str]:
+        key = text_digest(doc_id)
+        return os.path.join(self._index_dir, f"{key}.json"), os.path.join(self._index_dir, f"{key}.npy")
+
+    def _save_doc(self, stored: StoredDocument) -> None:
+        meta_path, codes_path = self._doc_paths(stored.id)
+        record = {
+            "id": stored.id,
+            "name": stored.name,
+            "type": stored.type,
+            "pages": stored.pages,
+            "preview": stored.preview,
+            "content_hash": stored.content_hash,
+            "status": stored.status,
+            "message": stored.message,
+            "texts": stored.texts,
+            "metadata": stored.metadata,
+            "scales": stored.scales.tolist(),
+            "has_embedding": stored.has_embedding.tolist(),
+            "saved_at": time.time(),
+        }
+        try:
+            os.makedirs(self._index_dir, exist_ok=True)
+            # Codes first: a document only counts as saved once its JSON is in place
+            _atomic_write(codes_path, lambda f: np.save(f, stored.embeddings), "wb")
+            _atomic_write(meta_path, lambda f: json.dump(record, f, ensure_ascii=False, default=str), "w")
+        except Exception as e:
+            print(f"[RagStore] 索引寫入失敗 {stored.id}: {e}")
+
+    def _load_index(self) -> None:
+        if not os.path.isdir(self._index_dir):
+            return
+        records = []
+        for entry in os.scandir(self._index_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    records.append((json.load(f), entry.path[: -len(".json")] + ".npy"))
+            except Exception as e:
+                print(f"[RagStore] 略過無法讀取的索引 {entry.name}: {e}")
+        records.sort(key=lambda item: item[0].get("saved_at", 0))
+        for record, codes_path in records:
+            try:
+                # Memory-mapped: the OS pages codes in on the first index rebuild
+                codes = np.load(codes_path, mmap_mode="r") if record["texts"] else None
+                stored = StoredDocument(
+                    id=record["id"],
+                    name=record["name"],
+                    type=record["type"],
+                    pages=record.get("pages"),
+                    preview=record.get("preview", ""),
+                    content_hash=record.get("content_hash"),
+                    status=record.get("status", "indexed"),
+                    message=record.get("message", ""),
+                )
+                if codes is not None:
+                    if codes.shape[0] != len(record["texts"]):
+                        raise ValueError(f"expected {len(record['texts'])} rows, got {codes.shape[0]}")
+                    stored.texts = record["texts"]
+                    stored.metadata = record["metadata"]
+                    stored.embeddings = codes
+                    stored.scales = np.asarray(record["scales"], dtype=np.float32)
+                    stored.has_embedding = np.asarray(record["has_embedding"], dtype=bool)
+            except Exception as e:
+                print(f"[RagStore] 略過損壞的索引 {record.get('id')}: {e}")
                 continue
-            embedding = embedder.get_embedding(text) if embedder else []
-            metadata = dict(doc.meta_data or {})
-            metadata["doc_id"] = stored.id
-            metadata["doc_name"] = stored.name
-            chunks.append(IndexedChunk(text=text, embedding=embedding, metadata=metadata))
-
-        stored.chunks = chunks
-        if chunks:
-            stored.preview = chunks[0].text[:400]
-
-    def index_pdf_bytes(self, data: bytes, filename: str) -> StoredDocument:
-        content_hash = self._hash_bytes(data)
+            self.docs[stored.id] = stored
+            if stored.content_hash:
+                self._register_hash(stored.content_hash, stored.id)
+        if self.docs:
+            print(f"[RagStore] 已載入 {len(self.docs)} 份已索引文件")
+
+    def _clear_search_cache(self) -> None:
+        self._search_cache.clear()
+        self._semantic_vectors = np.empty((0, 0), dtype=np.float32)
+        self._semantic_entries = []
+
+    def _semantic_lookup(self, scope: tuple, unit_query: np.ndarray) -> Optional[List[Dict[str, Any]]]:
+        if not self._semantic_entries or self._semantic_vectors.shape[1] != unit_query.shape[0]:
+            return None
+        sims = self._semantic_vectors @ unit_query
+        # Only entries above the threshold are ordered, usually none or a handful
+        hits = np.flatnonzero(sims >= SEMANTIC_CACHE_THRESHOLD)
+        for i in hits[np.argsort(-sims[hits], kind="stable")]:
+            entry_scope, results = self._semantic_entries[i]
+            if entry_scope == scope:
+                return results
+        return None
+
+    def _semantic_store(self, scope: tuple, unit_query: np.ndarray, results: List[Dict[str, Any]]) -> None:
+        if self._semantic_vectors.shape[1] != unit_query.shape[0]:
+            self._clear_semantic_entries(unit_query.shape[0])
+        self._semantic_vectors = np.vstack([self._semantic_vectors, unit_query])[-SEARCH_CACHE_SIZE:]
+        self._semantic_entries = (self._semantic_entries + [(scope, results)])[-SEARCH_CACHE_SIZE:]
+
+    def _clear_semantic_entries(self, dim: int) -> None:
+        self._semantic_vectors = np.empty((0, dim), dtype=np.float32)
+        self._semantic_entries = []
+
+    def _ensure_index(self) -> None:
+        if not self._index_dirty:
+            if self._appended_docs:
+                self._append_to_index(self._appended_docs)
+                self._appended_docs = []
+            return
+        docs = list(self.docs.values())
+        chunk_index = [(stored, row) for stored in docs for row in range(len(stored.texts))]
+        dim = next((stored.embeddings.shape[1] for stored in docs if stored.has_embedding.any()), 0)
+        # Documents embedded with the common dimension are scored densely; chunks without an
+        # embedding fall back to terms (a document of another dimension never matches)
+        dense_docs: List[Tuple[int, StoredDocument]] = []
+        dense_rows: List[np.ndarray] = []
+        offset = 0
+        for stored in docs:
+            if dim and stored.embeddings.shape[1] == dim:
+                dense_docs.append((offset, stored))
+                dense_rows.append(np.flatnonzero(stored.has_embedding) + offset)
+            offset += len(stored.texts)
+        self._dense_docs = dense_docs
+        self._dim = dim
+        self._dense_rows = (
+            np.concatenate(dense_rows).astype(np.intp, copy=False) if dense_rows else np.empty(0, dtype=np.intp)
+        )
+        self._has_embedding = (
+            np.concatenate([stored.has_embedding for stored in docs]) if docs else np.empty(0, dtype=bool)
+        )
+        self._faiss_index = self._build_faiss_index(dense_docs, dim, self._dense_rows.size)
+        self._chunk_index = chunk_index
+        self._lower_texts = None
+        self._char_postings = {}
+        self._index_dirty = False
+
+    def _append_to_index(self, docs: List[StoredDocument]) -> None:
+        offset = len(self._chunk_index)
+        # Same choice as a full rebuild: the index has no dimension yet only if no earlier document
+        # was embedded
+        dim = self._dim or next((stored.embeddings.shape[1] for stored in docs if stored.has_embedding.any()), 0)
+        dense_docs: List[Tuple[int, StoredDocument]] = []
+        dense_rows: List[np.ndarray] = [self._dense_rows]
+        for stored in docs:
+            if dim and stored.embeddings.shape[1] == dim:
+                dense_docs.append((offset, stored))
+                dense_rows.append(np.flatnonzero(stored.has_embedding) + offset)
+            self._chunk_index.extend((stored, row) for row in range(len(stored.texts)))
+            offset += len(stored.texts)
+        self._dense_docs.extend(dense_docs)
+        self._dim = dim
+        self._dense_rows = np.concatenate(dense_rows).astype(np.intp, copy=False)
+        self._has_embedding = np.concatenate([self._has_embedding, *(stored.has_embedding for stored in docs)])
+        rows = self._dense_rows.size
+        index = self._faiss_index
+        if index is None or (rows >= FAISS_HNSW_MIN_CHUNKS and not isinstance(index, faiss.IndexHNSWFlat)):
+            # Crossing a size threshold changes the index type: build it once from every document
+            self._faiss_index = self._build_faiss_index(self._dense_docs, dim, rows)
+        else:
+            _add_to_faiss(index, dense_docs)
+        self._lower_texts = None
+        self._char_postings = {}
+
+    def _ensure_term_index(self) -> None:
+        if self._lower_texts is not None:
+            return
+        lower_texts = [stored.texts[row].lower() for stored, row in self._chunk_index]
+        postings: Dict[str, List[int]] = {}
+        for i, text in enumerate(lower_texts):
+            for ch in set(text):
+                postings.setdefault(ch, []).append(i)
+        self._char_postings = {ch: np.asarray(rows, dtype=np.intp) for ch, rows in postings.items()}
+        self._lower_texts = lower_texts
+
+    def _lexical_candidates(self, query_terms: List[str]) -> np.ndarray:
+        """Rows whose text contains every character of at least one query term."""
+        # Terms are matched as substrings (CJK text has no word breaks), so postings are per character
+        empty = np.empty(0, dtype=np.intp)
+        matches = []
+        for term in set(query_terms):
+            lists = sorted((self._char_postings.get(ch, empty) for ch in set(term)), key=len)
+            rows = lists[0]
+            for other in lists[1:]:
+                if not rows.size:
+                    break
+                rows = np.intersect1d(rows, other, assume_unique=True)
+            matches.append(rows)
+        return np.unique(np.concatenate(matches)) if matches else empty
+
+    def _build_faiss_index(self, dense_docs: List[Tuple[int, StoredDocument]], dim: int, rows: int):
+        if faiss is None or rows < FAISS_MIN_CHUNKS:
+            return None
+        if rows >= FAISS_HNSW_MIN_CHUNKS:
+            index = faiss.IndexHNSWFlat(dim, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+        else:
+            index = faiss.IndexFlatIP(dim)
+        _add_to_faiss(index, dense_docs)
+        return index
+
+    def index_pdf_bytes(
+        self, data: bytes, filename: str, content_hash: Optional[str] = None
+    ) -> StoredDocument:
+        # Page counting overlaps with hashing and text extraction
+        pages_future = self._get_pool().submit(self._count_pdf_pages, data)
+        # Callers that already hashed the upload (e.g. for its tag key) pass the digest in
+        content_hash = content_hash or self._hash_bytes(data)
+        existing = self._find_by_hash(content_hash)
+        if existing:
+            pages_future.cancel()
+            return existing
+        name = os.path.splitext(filename)[0]
+        docs = PDFReader(chunking_strategy=self._chunker).read(io.BytesIO(data), name=name)
+        return self._store_upload(name, "PDF", content_hash, docs, pages_future.result())
+
+    def index_text_bytes(
+        self, data: bytes, filename: str, content_hash: Optional[str] = None
+    ) -> StoredDocument:
+        # Callers that already hashed the upload (e.g. for its tag key) pass the digest in
+        content_hash = content_hash or self._hash_bytes(data)
         existing = self._find_by_hash(content_hash)
         if existing:
             return existing
-        doc_id = str(uuid.uuid4())
         name = os.path.splitext(filename)[0]
-        pages = self._count_pdf_pages(data)
-        docs = self._pdf_reader.read(io.BytesIO(data), name=name)
+        docs = TextReader(chunking_strategy=self._chunker).read(io.BytesIO(data), name=name)
+        return self._store_upload(name, "TEXT", content_hash, docs)
+
+    def _store_upload(
+        self, name: str, doc_type: str, content_hash: str, docs: List[Document], pages: Optional[int] = None
+    ) -> StoredDocument:
         stored = StoredDocument(
-            id=doc_id,
+            id=str(uuid.uuid4()),
             name=name,
-            type="PDF",
+            type=doc_type,
             pages=pages,
             content_hash=content_hash,
         )
         self._index_documents(stored, docs)
-        self.docs[doc_id] = stored
+        self._put_doc(stored)
+        self._register_hash(content_hash, stored.id)
         return stored
 
-    def index_text_bytes(self, data: bytes, filename: str) -> StoredDocument:
-        content_hash = self._hash_bytes(data)
-        existing = self._find_by_hash(content_hash)
-        if existing:
-            return existing
-        doc_id = str(uuid.uuid4())
+    def _read_upload(self, data: bytes, filename: str, content_hash: Optional[str]) -> tuple:
+        content_hash = content_hash or self._hash_bytes(data)
+        if self._find_by_hash(content_hash):
+            return content_hash, None, None
         name = os.path.splitext(filename)[0]
-        docs = self._text_reader.read(io.BytesIO(data), name=name)
-        stored = StoredDocument(id=doc_id, name=name, type="TEXT", content_hash=content_hash)
-        self._index_documents(stored, docs)
-        self.docs[doc_id] = stored
-        return stored
+        # Runs on pool threads: readers are not shared, each task builds its own
+        if filename.lower().endswith(".pdf"):
+            reader = PDFReader(chunking_strategy=self._chunker)
+            return content_hash, reader.read(io.BytesIO(data), name=name), self._count_pdf_pages(data)
+        return content_hash, TextReader(chunking_strategy=self._chunker).read(io.BytesIO(data), name=name), None
+
+    def index_many(
+        self, files: List[Tuple[bytes, str]], content_hashes: Optional[List[Optional[str]]] = None
+    ) -> List[StoredDocument]:
+        """Index several uploads (.pdf, otherwise text), parsing them concurrently.
+
+        Results keep the input order; a file that fails to parse is registered as a stub carrying the error.
+        """
+        hashes = content_hashes or [None] * len(files)
+        futures = [
+            self._get_pool().submit(self._read_upload, data, filename, content_hash)
+            for (data, filename), content_hash in zip(files, hashes)
+        ]
+        results: List[StoredDocument] = []
+        for (data, filename), future in zip(files, futures):
+            ext = os.path.splitext(filename)[1]
+            try:
+                content_hash, docs, pages = future.result()
+                # Also catches a file repeated within the same batch
+                existing = self._find_by_hash(content_hash)
+                if existing:
+                    results.append(existing)
+                    continue
+                doc_type = "PDF" if ext.lower() == ".pdf" else "TEXT"
+                results.append(self._store_upload(os.path.splitext(filename)[0], doc_type, content_hash, docs, pages))
+            except Exception as exc:
+                results.append(self.register_stub(filename, ext.upper().lstrip(".") or "FILE", str(exc)))
+        return results
 
     def index_inline_text(self, doc_id: str, name: str, text: str, doc_type: str = "TEXT") -> StoredDocument:
-        content_hash = self._hash_text(text)
+        encoded = text.encode("utf-8")
+        content_hash = self._hash_bytes(encoded)
         existing = self.docs.get(doc_id)
         if existing and existing.content_hash == content_hash:
             return existing
@@ -141,7 +556,9 @@ class RagStore:
             content_hash=content_hash,
         )
         self._index_documents(stored, docs)
-        self.docs[doc_id] = stored
+        self._put_doc(stored)
+        # Uploaded bytes identical to this text still deduplicate against it
+        self._register_hash(content_hash, doc_id)
         return stored
 
     def register_stub(self, filename: str, doc_type: str, message: str) -> StoredDocument:
@@ -154,7 +571,7 @@ class RagStore:
             status="unsupported",
             message=message,
         )
-        self.docs[doc_id] = stored
+        self._put_doc(stored)
         return stored
 
     def search(self, query: str, doc_ids: Optional[List[str]] = None, top_k: int = 5) -> List[Dict[str, Any]]:
@@ -163,53 +580,178 @@ class RagStore:
             return []
 
         embedder = self._get_embedder()
-        query_embedding = embedder.get_embedding(query) if embedder else []
+        # Cached results are only reused for the same model, top_k and document filter
+        scope = (getattr(embedder, "id", None) if embedder else None, top_k, tuple(doc_ids or ()))
+        cache_key = (scope, query)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            return _copy_results(cached)
+
+        query_embedding = self._embed_query(embedder, query) if embedder else _as_vector([])
+        query_norm = float(np.linalg.norm(query_embedding)) if query_embedding.size else 0.0
+        unit_query = query_embedding / query_norm if query_norm > 0 else None
+        if unit_query is not None:
+            cached = self._semantic_lookup(scope, unit_query)
+            if cached is not None:
+                return _copy_results(cached)
+
+        results = self._search_uncached(query, query_embedding, doc_ids, top_k)
+        if embedder is not None and not query_embedding.size:
+            # The query embedding failed: these lexical-only results must not outlive the outage
+            return results
+
+        self._search_cache[cache_key] = results
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        if unit_query is not None:
+            self._semantic_store(scope, unit_query, results)
+        return _copy_results(results)
+
+    def _search_uncached(
+        self, query: str, query_embedding: np.ndarray, doc_ids: Optional[List[str]], top_k: int
+    ) -> List[Dict[str, Any]]:
         query_terms = [term.lower() for term in query.split() if term.strip()]
 
-        scored = []
-        for doc_id, stored in self.docs.items():
-            if doc_ids and doc_id not in doc_ids:
-                continue
-            for chunk in stored.chunks:
-                score = self._score_chunk(chunk, query_embedding, query_terms)
-                if score <= 0:
-                    continue
-                scored.append((score, stored, chunk))
+        self._ensure_index()
+        chunk_index = self._chunk_index
+        if not chunk_index:
+            return []
+
+        scores = np.zeros(len(chunk_index), dtype=np.float64)
+        lexical = np.ones(len(chunk_index), dtype=bool)
+        if query_embedding.size:
+            # Chunks with an embedding are scored by cosine only, as before
+            lexical = ~self._has_embedding
+            query_norm = float(np.linalg.norm(query_embedding))
+            if query_norm > 0 and self._dim == query_embedding.shape[0] and self._dense_rows.size:
+                q = query_embedding / query_norm
+                if self._faiss_index is not None and not doc_ids:
+                    # Only the index's top hits get a dense score; the rest cannot reach the top k anyway
+                    distances, ids = self._faiss_index.search(q.reshape(1, -1), max(top_k, 1))
+                    found = ids[0] >= 0
+                    scores[self._dense_rows[ids[0][found]]] = distances[0][found]
+                else:
+                    # Rows without an embedding have zero codes and scale, so they stay at 0 here
+                    q = q.astype(np.float32)
+                    for offset, stored in self._dense_docs:
+                        scores[offset:offset + len(stored.texts)] = _dense_scores(stored.embeddings, q) * stored.scales
+        if query_terms and lexical.any():
+            self._ensure_term_index()
+            rows = self._lexical_candidates(query_terms)
+            for i in rows[lexical[rows]]:
+                scores[i] = _lexical_score(self._lower_texts[i], query_terms)
+
+        candidates = scores > 0
+        if doc_ids:
+            allowed = set(doc_ids)
+            candidates &= np.fromiter(
+                (stored.id in allowed for stored, _ in chunk_index), dtype=bool, count=len(chunk_index)
+            )
+        top = _top_k_indices(scores, np.flatnonzero(candidates), max(top_k, 1))
 
-        scored.sort(key=lambda item: item[0], reverse=True)
         results = []
-        for score, stored, chunk in scored[: max(top_k, 1)]:
+        for i in top:
+            stored, row = chunk_index[i]
             results.append(
                 {
-                    "content": chunk.text,
+                    "content": stored.texts[row],
                     "metadata": {
                         "doc_id": stored.id,
                         "doc_name": stored.name,
                         "type": stored.type,
                         "pages": stored.pages,
-                        **(chunk.metadata or {}),
-                        "score": round(score, 4),
+                        **stored.metadata[row],
+                        "score": round(float(scores[i]), 4),
                     },
                 }
             )
         return results
 
-    def _score_chunk(
-        self, chunk: IndexedChunk, query_embedding: List[float], query_terms: List[str]
-    ) -> float:
-        if query_embedding and chunk.embedding:
-            return self._cosine_similarity(query_embedding, chunk.embedding)
-        if not query_terms:
-            return 0.0
-        text_lower = chunk.text.lower()
-        return float(sum(text_lower.count(term) for term in query_terms))
-
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        if not a or not b:
-            return 0.0
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = math.sqrt(sum(x * x for x in a))
-        norm_b = math.sqrt(sum(y * y for y in b))
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
+
+def _atomic_write(path: str, write, mode: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _add_to_faiss(index, dense_docs: List[Tuple[int, StoredDocument]]) -> None:
+    # Added per document, in _dense_rows order, so only one document is ever dequantized at a time
+    for _, stored in dense_docs:
+        mask = stored.has_embedding
+        if mask.any():
+            index.add(stored.embeddings[mask].astype(np.float32) * stored.scales[mask, None])
+
+
+def _embed_texts(embedder: OpenAIEmbedder, texts: List[str]) -> List[List[float]]:
+    """Embed texts in batched requests, in input order; empty vectors for failures."""
+    vectors: List[List[float]] = []
+    for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+        batch = texts[start:start + EMBEDDING_BATCH_SIZE]
+        try:
+            # OpenAIEmbedder.response() passes its input straight to embeddings.create, which takes a list
+            response = embedder.response(text=batch)
+            data = sorted(response.data, key=lambda item: item.index)
+            if len(data) != len(batch):
+                raise ValueError(f"expected {len(batch)} embeddings, got {len(data)}")
+            vectors.extend(item.embedding for item in data)
+        except Exception as e:
+            print(f"[RagStore] 批次 embedding 失敗，改為逐筆請求: {e}")
+            with ThreadPoolExecutor(max_workers=min(EMBEDDING_FALLBACK_WORKERS, len(batch))) as executor:
+                vectors.extend(executor.map(embedder.get_embedding, batch))
+    return vectors
+
+
+def _quantize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization: row ~= codes * scale."""
+    if not matrix.size:
+        return np.zeros(matrix.shape, dtype=np.int8), np.zeros(matrix.shape[0], dtype=np.float32)
+    max_abs = np.abs(matrix).max(axis=1)
+    scales = (max_abs / 127.0).astype(np.float32)
+    safe = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.rint(matrix / safe[:, None]).astype(np.int8)
+    return codes, scales
+
+
+def _dense_scores(codes: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """codes @ q, converting SCORE_BLOCK_ROWS rows at a time so the float32 copy stays in cache."""
+    scores = np.empty(codes.shape[0], dtype=np.float32)
+    buffer = np.empty((min(SCORE_BLOCK_ROWS, codes.shape[0]), codes.shape[1]), dtype=np.float32)
+    for start in range(0, codes.shape[0], SCORE_BLOCK_ROWS):
+        block = codes[start:start + SCORE_BLOCK_ROWS]
+        rows = buffer[: block.shape[0]]
+        np.copyto(rows, block)
+        np.matmul(rows, q, out=scores[start:start + block.shape[0]])
+    return scores
+
+
+def _copy_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Callers may mutate the returned dicts; keep the cached copies intact
+    return [{"content": item["content"], "metadata": dict(item["metadata"])} for item in results]
+
+
+def _lexical_score(text_lower: str, query_terms: List[str]) -> float:
+    return float(sum(text_lower.count(term) for term in query_terms))
+
+
+def _top_k_indices(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """Highest-scoring candidates, ties broken by position (same order as a stable sort)."""
+    if candidates.size > k:
+        values = scores[candidates]
+        kth = np.partition(values, values.size - k)[values.size - k]
+        above = candidates[values > kth]
+        at_kth = candidates[values == kth][: k - above.size]
+        candidates = np.concatenate([above, at_kth])
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def _as_vector(values: Any) -> np.ndarray:
+    return np.asarray(values if values is not None else [], dtype=np.float32)
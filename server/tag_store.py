@@ -2,7 +2,7 @@
 標籤儲存管理模組
 使用記憶體儲存（多用戶隔離）
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 
 LEGACY_USER_KEY = "__legacy__"
@@ -11,16 +11,14 @@ LEGACY_USER_KEY = "__legacy__"
 _tag_store: Dict[str, Any] = {"users": {}}
 
 
-def _dedupe_list(values: List[str]) -> List[str]:
-    """去重並保持順序"""
-    seen = set()
-    deduped = []
-    for value in values:
-        if value in seen:
-            continue
-        seen.add(value)
-        deduped.append(value)
-    return deduped
+def _dedupe_list(values: Iterable[str]) -> List[str]:
+    """去重並保持順序（dict 保留插入順序）"""
+    return list(dict.fromkeys(values))
+
+
+def _clean_tags(tags: Iterable[Any]) -> List[str]:
+    """只保留字串標籤並去重（單次走訪）"""
+    return _dedupe_list(tag for tag in tags if isinstance(tag, str))
 
 
 def _normalize_user_key(user_id: Optional[str]) -> str:
@@ -75,21 +73,19 @@ def get_doc_tags(tag_key: str, user_id: Optional[str] = None) -> List[str]:
         標籤列表
     """
     user_key = _normalize_user_key(user_id)
-    user_bucket = _get_user_bucket(user_key)
-    tags = user_bucket.get("docs", {}).get(tag_key, [])
+    # _get_user_bucket 已保證 docs 為 dict、custom_tags 為 list
+    docs = _get_user_bucket(user_key)["docs"]
+    tags = docs.get(tag_key, [])
     if isinstance(tags, list):
         return tags
 
     # 兼容舊資料：若 user bucket 沒有，嘗試從 legacy bucket 讀取並遷移
     if user_key != LEGACY_USER_KEY:
-        legacy_bucket = _get_user_bucket(LEGACY_USER_KEY, create=False)
-        legacy_docs = legacy_bucket.get("docs", {})
-        legacy_tags = legacy_docs.get(tag_key, []) if isinstance(legacy_docs, dict) else []
+        legacy_tags = _get_user_bucket(LEGACY_USER_KEY, create=False)["docs"].get(tag_key, [])
         if isinstance(legacy_tags, list):
-            _get_user_bucket(user_key).get("docs", {})[tag_key] = _dedupe_list(
-                [tag for tag in legacy_tags if isinstance(tag, str)]
-            )
-            return _get_user_bucket(user_key).get("docs", {}).get(tag_key, [])
+            migrated = _clean_tags(legacy_tags)
+            docs[tag_key] = migrated
+            return migrated
 
     return []
 
@@ -103,11 +99,7 @@ def set_doc_tags(tag_key: str, tags: List[str], user_id: Optional[str] = None) -
         tags: 標籤列表
         user_id: 使用者 ID
     """
-    docs = _get_user_bucket(user_id).get("docs", {})
-    if not isinstance(docs, dict):
-        docs = {}
-        _get_user_bucket(user_id)["docs"] = docs
-    docs[tag_key] = _dedupe_list([tag for tag in tags if isinstance(tag, str)])
+    _get_user_bucket(user_id)["docs"][tag_key] = _clean_tags(tags)
 
 
 def get_custom_tags(user_id: Optional[str] = None) -> List[str]:
@@ -121,19 +113,20 @@ def get_custom_tags(user_id: Optional[str] = None) -> List[str]:
         自訂標籤列表
     """
     user_key = _normalize_user_key(user_id)
-    user_tags = _get_user_bucket(user_key).get("custom_tags", [])
-    if isinstance(user_tags, list) and user_tags:
+    bucket = _get_user_bucket(user_key)
+    user_tags = bucket["custom_tags"]
+    if user_tags:
         return user_tags
 
     # 兼容舊資料：fallback legacy custom tags
     if user_key != LEGACY_USER_KEY:
-        legacy_tags = _get_user_bucket(LEGACY_USER_KEY, create=False).get("custom_tags", [])
-        if isinstance(legacy_tags, list) and legacy_tags:
-            migrated = _dedupe_list([tag for tag in legacy_tags if isinstance(tag, str)])
-            _get_user_bucket(user_key)["custom_tags"] = migrated
+        legacy_tags = _get_user_bucket(LEGACY_USER_KEY, create=False)["custom_tags"]
+        if legacy_tags:
+            migrated = _clean_tags(legacy_tags)
+            bucket["custom_tags"] = migrated
             return migrated
 
-    return user_tags if isinstance(user_tags, list) else []
+    return user_tags
 
 
 def set_custom_tags(tags: List[str], user_id: Optional[str] = None) -> None:
@@ -144,9 +137,7 @@ def set_custom_tags(tags: List[str], user_id: Optional[str] = None) -> None:
         tags: 自訂標籤列表
         user_id: 使用者 ID
     """
-    _get_user_bucket(user_id)["custom_tags"] = _dedupe_list(
-        [tag for tag in tags if isinstance(tag, str)]
-    )
+    _get_user_bucket(user_id)["custom_tags"] = _clean_tags(tags)
 
 
 def load_tag_store(user_id: Optional[str] = None) -> Dict[str, Any]:
@@ -160,12 +151,7 @@ def load_tag_store(user_id: Optional[str] = None) -> Dict[str, Any]:
         標籤儲存資料
     """
     bucket = _get_user_bucket(user_id)
-    docs = bucket.get("docs", {})
-    custom_tags = bucket.get("custom_tags", [])
-    return {
-        "docs": docs if isinstance(docs, dict) else {},
-        "custom_tags": custom_tags if isinstance(custom_tags, list) else [],
-    }
+    return {"docs": bucket["docs"], "custom_tags": bucket["custom_tags"]}
 
 
 def clear_all_tags(user_id: Optional[str] = None) -> None:
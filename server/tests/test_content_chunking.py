@@ -0,0 +1,46 @@
+"""
+測試 content-defined chunking - 插入文字只影響附近的 chunk
+"""
+import sys
+import random
+from pathlib import Path
+
+server_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(server_dir))
+
+from agno.knowledge.document.base import Document
+from content_chunking import ContentDefinedChunking
+
+
+def _sample_text(words=20000):
+    rng = random.Random(7)
+    vocab = ["越南", "新聞", "economy", "market", "trade", "政策", "投資", "growth"]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+def test_chunks_cover_text_within_size_bounds():
+    chunker = ContentDefinedChunking(min_size=800, avg_size=1200, max_size=2000)
+    text = _sample_text()
+    chunks = chunker.chunk(Document(name="doc", id="doc-1", content=text))
+
+    # Every chunk after the first starts with the last 200 characters of the previous one
+    assert all(prev.content[-200:] == c.content[:200] for prev, c in zip(chunks, chunks[1:]))
+    assert chunks[0].content + "".join(c.content[200:] for c in chunks[1:]) == chunker.clean_text(text)
+    sizes = [len(chunks[0].content)] + [len(c.content) - 200 for c in chunks[1:]]
+    assert all(size <= 2000 for size in sizes)
+    assert all(size >= 800 for size in sizes[:-1])
+    assert [c.meta_data["chunk"] for c in chunks] == list(range(1, len(chunks) + 1))
+    assert chunks[0].id == "doc-1_1"
+
+
+def test_insert_only_changes_local_chunks():
+    chunker = ContentDefinedChunking()
+    text = _sample_text()
+    edited = text[:5000] + "插入一段新的文字 " + text[5000:]
+
+    before = {c.content for c in chunker.chunk(Document(name="doc", content=text))}
+    after = {c.content for c in chunker.chunk(Document(name="doc", content=edited))}
+
+    # The edited chunk, plus the overlap it hands to the next one
+    assert len(after - before) <= 3
+    assert len(before & after) >= len(before) - 3
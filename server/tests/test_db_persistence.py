@@ -49,6 +49,38 @@ def test_news_store_persistence():
     print("✓ 已清理測試資料")
 
 
+def test_news_store_add_records_batch(tmp_path):
+    """測試 add_records 批次寫入並略過缺少 id 的記錄"""
+    from news_store import NewsStore
+    store = NewsStore(str(tmp_path / "batch.db"))
+    
+    records = [
+        {"id": f"batch-{i}", "name": f"新聞 {i}", "tags": ["越南"]}
+        for i in range(5)
+    ]
+    records.append({"name": "缺少 id"})
+    
+    assert store.add_records(records, user_id="user-a") == 5
+    saved = store.get_all_records(user_id="user-a")
+    assert len(saved) == 5
+    assert all(r["tags"] == ["越南"] for r in saved)
+    assert store.add_records([]) == 0
+
+
+def test_news_store_iter_records_raises_on_error(tmp_path):
+    """測試 iter_records 讀取失敗時拋出例外，get_all_records 仍回傳空列表"""
+    import sqlite3
+    import pytest
+    from news_store import NewsStore
+    store = NewsStore(str(tmp_path / "broken.db"))
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("DROP TABLE news_records")
+
+    with pytest.raises(sqlite3.OperationalError):
+        next(store.iter_records(user_id="user-a"))
+    assert store.get_all_records(user_id="user-a") == []
+
+
 def test_tag_store_persistence():
     """測試 tag_store 不會在重複 import 時清空"""
     print("\n=== 測試 tag_store 持久性 ===")
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import email_service  # noqa: E402
+
+
+def test_report_html_escapes_fields():
+    html = email_service.generate_news_report_html(
+        "<報告>",
+        [{"title": "<script>alert(1)</script>", "date": "2025-01-01", "summary": 'a & "b"', "link": ""}],
+    )
+    assert "<script>" not in html
+    assert "&lt;報告&gt;" in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "a &amp; &quot;b&quot;" in html
+
+
+def test_report_html_drops_non_http_links():
+    html = email_service.generate_news_report_html(
+        "doc",
+        [
+            {"title": "壞連結", "summary": "x", "link": "javascript:alert(1)"},
+            {"title": "好連結", "summary": "y", "link": "https://vnexpress.net/a?b=1&c=2"},
+        ],
+    )
+    assert "javascript:" not in html
+    assert 'href="https://vnexpress.net/a?b=1&amp;c=2"' in html
+
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import excel_service  # noqa: E402
+
+
+def test_country_prefers_trusted_domain():
+    content = "越南 越南 越南\n來源：https://www.bangkokpost.com/business/1"
+    assert excel_service.extract_country_from_content(content, fallback_name="") == "泰國"
+
+
+def test_country_falls_back_to_name():
+    assert excel_service.extract_country_from_content("無網址內容", fallback_name="Vietnam 週報") == "越南"
+    # 內容中的國家字樣不作判斷依據（"vn"、"lao" 等短關鍵字會命中一般英文單字）
+    content = "泰國央行維持利率，Thailand 出口回升，泰國觀光成長。"
+    assert excel_service.extract_country_from_content(content, fallback_name="週報") == " "
+
+
+class _FakeCompletions:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _fake_client(monkeypatch, reply):
+    completions = _FakeCompletions(reply)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(excel_service, "_get_openai_client", lambda api_key: client)
+    excel_service._translation_cache.clear()
+    return completions
+
+
+def test_translations_follow_number_prefix(monkeypatch):
+    completions = _fake_client(monkeypatch, "1. 央行降息\n\n2. 出口成長\n3. 股市上漲")
+    titles = ["Central bank cuts rates", "Exports grow", "Stocks rise"]
+    result = excel_service.batch_translate_titles(titles)
+    assert [result[t] for t in titles] == ["央行降息", "出口成長", "股市上漲"]
+
+    # 完整回覆會寫入快取，第二次不再呼叫 API
+    excel_service.batch_translate_titles(titles)
+    assert completions.calls == 1
+
+
+def test_incomplete_reply_is_not_cached(monkeypatch):
+    completions = _fake_client(monkeypatch, "1. 央行降息\n3. 股市上漲")
+    titles = ["Central bank cuts rates", "Exports grow", "Stocks rise"]
+    result = excel_service.batch_translate_titles(titles)
+    assert [result[t] for t in titles] == ["央行降息", "Exports grow", "股市上漲"]
+
+    excel_service.batch_translate_titles(titles)
+    assert completions.calls == 2
+
+
+def test_translation_splits_large_batches(monkeypatch):
+    completions = _fake_client(monkeypatch, "")
+    titles = [f"Headline {i}" for i in range(excel_service.TRANSLATION_BATCH_SIZE * 2 + 1)]
+    result = excel_service.batch_translate_titles(titles)
+    assert completions.calls == 3
+    assert all(result[t] == t for t in titles)
+
+
+def test_export_file_follows_umask(tmp_path):
+    filepath = tmp_path / "news.xlsx"
+    excel_service._write_news_workbook([{"title": "標題", "date": "2024-01-01"}], str(filepath))
+    assert filepath.stat().st_mode & 0o777 == excel_service._NEW_FILE_MODE
@@ -0,0 +1,30 @@
+"""
+測試 RagStore 索引持久化 - 重新建立實例後文件與搜尋結果仍然存在
+"""
+import sys
+from pathlib import Path
+
+server_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(server_dir))
+
+from rag_store import RagStore
+
+
+def test_rag_store_reloads_index(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    index_dir = str(tmp_path / "rag_index")
+
+    store = RagStore(index_dir=index_dir)
+    stored = store.index_inline_text("news-1", "越南新聞", "越南 央行 宣布 降息 " * 200)
+    store.register_stub("report.docx", "DOCX", "尚未支援此格式")
+    results = store.search("降息", top_k=3)
+    assert results
+
+    reloaded = RagStore(index_dir=index_dir)
+    assert list(reloaded.docs) == list(store.docs)
+    assert reloaded.docs["news-1"].texts == stored.texts
+    assert reloaded.search("降息", top_k=3) == results
+
+    # 相同內容重新上傳時直接回傳已載入的文件
+    again = reloaded.index_inline_text("news-1", "越南新聞", "越南 央行 宣布 降息 " * 200)
+    assert again is reloaded.docs["news-1"]
@@ -20,7 +20,7 @@ except ImportError:
 ROOT_DIR = Path(__file__).resolve().parent.parent
 ENV_PATH = ROOT_DIR / ".env"
 
-REQUIRED_KEYS = [
+REQUIRED_KEYS = (
     "OPENAI_API_KEY",
     "APP_USERNAME",
     "APP_PASSWORD",
@@ -29,9 +29,12 @@ REQUIRED_KEYS = [
     "SMTP_PORT",
     "EMAIL_ADDRESS",
     "EMAIL_PASSWORD",
-]
+)
 
-DOMAIN_PATTERN = re.compile(r"^[a-z0-9.-]+\.[a-z]{2,}$", re.IGNORECASE)
+OPTIONAL_KEYS = ("VITE_GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_ID", "GOOGLE_ALLOWED_DOMAINS")
+
+# Matched against lowercased input; ASCII-only classes, no Unicode case folding
+DOMAIN_PATTERN = re.compile(r"^[a-z0-9.-]+\.[a-z]{2,}$", re.ASCII)
 
 
 def parse_csv(raw: str) -> List[str]:
@@ -39,39 +42,60 @@ def parse_csv(raw: str) -> List[str]:
 
 
 def validate_smtp_port(value: str) -> bool:
-    if not value or not value.isdigit():
+    # Same parse as email_service, which reads the port with int(SMTP_PORT)
+    try:
+        port = int(value)
+    except ValueError:
         return False
-    port = int(value)
     return 1 <= port <= 65535
 
 
 def main() -> int:
-    if dotenv is not None:
-        dotenv.load_dotenv(ENV_PATH, override=False)
-    elif ENV_PATH.exists():
-        for raw_line in ENV_PATH.read_text(encoding="utf-8").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if key and key not in os.environ:
-                os.environ[key] = value
+    # .env never overrides existing variables, so it only matters for checked keys still unset
+    pending = {key for key in (*REQUIRED_KEYS, *OPTIONAL_KEYS) if key not in os.environ}
+    # Skipped when the environment already provides every checked key (CI, container, systemd)
+    if pending:
+        if dotenv is not None:
+            dotenv.load_dotenv(ENV_PATH, override=False)
+        elif ENV_PATH.exists():
+            # Stop reading once none of the checked keys is still unset
+            with ENV_PATH.open("r", encoding="utf-8") as fh:
+                for raw_line in fh:
+                    if not pending:
+                        break
+                    line = raw_line.strip()
+                    if not line or line[0] == "#":
+                        continue
+                    key, sep, value = line.partition("=")
+                    if not sep:
+                        continue
+                    key = key.strip()
+                    value = value.strip()
+                    # Drop one pair of matching surrounding quotes, as python-dotenv does
+                    if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+                        value = value[1:-1]
+                    if key and key not in os.environ:
+                        os.environ[key] = value
+                    pending.discard(key)
+
+    # Snapshot once; every check below is a plain dict lookup
+    env = dict(os.environ)
 
     errors: List[str] = []
     warnings: List[str] = []
 
     for key in REQUIRED_KEYS:
-        if not os.getenv(key, "").strip():
+        value = env.get(key)
+        # strip() only runs for non-empty values
+        if not value or not value.strip():
             errors.append(f"Missing required key: {key}")
 
-    smtp_port = os.getenv("SMTP_PORT", "").strip()
+    smtp_port = env.get("SMTP_PORT", "").strip()
     if smtp_port and not validate_smtp_port(smtp_port):
         errors.append("SMTP_PORT must be an integer between 1 and 65535")
 
-    google_client_front = os.getenv("VITE_GOOGLE_CLIENT_ID", "").strip()
-    google_client_back = os.getenv("GOOGLE_CLIENT_ID", "").strip()
+    google_client_front = env.get("VITE_GOOGLE_CLIENT_ID", "").strip()
+    google_client_back = env.get("GOOGLE_CLIENT_ID", "").strip()
 
     if google_client_back:
         if google_client_front and google_client_front != google_client_back:
@@ -85,8 +109,8 @@ def main() -> int:
     else:
         warnings.append("Google OAuth is disabled (client IDs are empty)")
 
-    allowed_domains = parse_csv(os.getenv("GOOGLE_ALLOWED_DOMAINS", ""))
-    invalid_domains = [domain for domain in allowed_domains if not DOMAIN_PATTERN.match(domain)]
+    allowed_domains = parse_csv(env.get("GOOGLE_ALLOWED_DOMAINS", ""))
+    invalid_domains = [domain for domain in allowed_domains if not DOMAIN_PATTERN.match(domain.lower())]
     if invalid_domains:
         errors.append(
             "GOOGLE_ALLOWED_DOMAINS contains invalid domain(s): "